@@ -7,8 +7,17 @@ Links:
     https://en.wikipedia.org/wiki/Chladni%27s_law
 """
 
+import hashlib
+import numbers
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from multiprocessing import Pool
+from pathlib import Path
+
 import numpy as np
-from PIL import Image
+from PIL import Image, ImageDraw
+from scipy import sparse
+from scipy.sparse import linalg
 
 
 def chladni_func(
@@ -52,6 +61,63 @@ def min_max_scaling(array: np.ndarray) -> np.ndarray:
     return (array - min_val) / (max_val - min_val)
 
 
+@lru_cache(maxsize=256)
+def _sin_table(size: int, k: float) -> np.ndarray:
+    """Sine table sin(pi * k * t) for t in linspace(-1, 1, size).
+
+    Tables are cached per process, so every tile of a gallery shares them.
+
+    Args:
+        size (int): Number of samples.
+        k (float): Mode number.
+
+    Returns:
+        np.ndarray: Sine table
+    """
+    table = np.sin(np.pi * k * np.linspace(-1.0, 1.0, size))
+    table.flags.writeable = False
+    return table
+
+
+def chladni_grid(
+    width: int = 512,
+    height: int = 512,
+    m: float = 1,
+    n: float = 1,
+    a: float = 1,
+    b: float = 1,
+) -> np.ndarray:
+    """Chladni function on a (height, width) grid over [-1, 1]^2.
+
+    Separable equivalent of `chladni_func` on a meshgrid, built from cached
+    1-D sine tables instead of full-size coordinate arrays.
+
+    Args:
+        width (int, optional): Img width. Defaults to 512.
+        height (int, optional): Img height. Defaults to 512.
+        m (float, optional): m parameter. Defaults to 1.
+        n (float, optional): n parameter. Defaults to 1.
+        a (float, optional): a parameter. Defaults to 1.
+        b (float, optional): b parameter. Defaults to 1.
+
+    Returns:
+        np.ndarray: Output array
+    """
+    results = np.outer(_sin_table(height, m), a * _sin_table(width, n))
+    results += np.outer(_sin_table(height, n), b * _sin_table(width, m))
+    return np.abs(results, out=results)
+
+
+def _sand(results: np.ndarray, random_array: np.ndarray) -> np.ndarray:
+    results = abs(min_max_scaling(results) - 1)  # Inversion
+    results = results**7  # Contrast
+
+    # Simple sand effect
+    results = np.where(random_array > 0.65, random_array, 0) * results
+
+    return (min_max_scaling(results) * 255).astype(np.uint8)
+
+
 def chladni(
     width: int = 512,
     height: int = 512,
@@ -79,14 +145,428 @@ def chladni(
         np.linspace(-1.0, 1.0, shape[0]),
     )
     results = chladni_func(x, y, m=m, n=n, a=a, b=b)
-    results = abs(min_max_scaling(results) - 1)  # Inversion
-    results = results**7  # Contrast
+    return _sand(results, np.random.random(shape))
 
-    # Simple sand effect
-    random_array = np.random.random(shape)
-    results = np.where(random_array > 0.65, random_array, 0) * results
 
-    return (min_max_scaling(results) * 255).astype(np.uint8)
+def _gallery_tile(args: tuple) -> np.ndarray:
+    width, height, mode, seed_seq = args
+    m, n, a, b = mode
+    rng = np.random.default_rng(seed_seq)
+    results = chladni_grid(width, height, m=m, n=n, a=a, b=b)
+    return _sand(results, rng.random((height, width)))
+
+
+def chladni_gallery(
+    modes: Iterable[tuple[float, float, float, float]],
+    width: int = 128,
+    height: int = 128,
+    seed: int | None = None,
+    processes: int | None = None,
+) -> Iterator[np.ndarray]:
+    """Chladni gallery
+
+    Renders one tile per (m, n, a, b) mode over a process pool. Each tile
+    gets its own sand mask generator spawned from `seed`, so the output does
+    not depend on the number of processes or on scheduling.
+
+    Args:
+        modes (Iterable[tuple]): (m, n, a, b) parameters of each tile.
+        width (int, optional): Tile width. Defaults to 128.
+        height (int, optional): Tile height. Defaults to 128.
+        seed (int, optional): Sand mask seed. Defaults to None.
+        processes (int, optional): Number of processes. Defaults to None
+            (CPU count).
+
+    Yields:
+        np.ndarray: Tiles, in the order of `modes`.
+    """
+    modes = list(modes)
+    seed_seqs = np.random.SeedSequence(seed).spawn(len(modes))
+    tasks = [
+        (width, height, mode, seed_seq)
+        for mode, seed_seq in zip(modes, seed_seqs)
+    ]
+    with Pool(processes) as pool:
+        yield from pool.imap(_gallery_tile, tasks)
+
+
+def mosaic(tiles: Iterable[np.ndarray], columns: int) -> np.ndarray:
+    """Mosaic
+
+    Args:
+        tiles (Iterable[np.ndarray]): Tiles of equal shape.
+        columns (int): Number of columns.
+
+    Returns:
+        np.ndarray: Mosaic array
+    """
+    tiles = list(tiles)
+    if not tiles:
+        raise ValueError("No tiles to arrange")
+    height, width = tiles[0].shape
+    rows = -(-len(tiles) // columns)
+    output = np.zeros((rows * height, columns * width), dtype=tiles[0].dtype)
+    for i, tile in enumerate(tiles):
+        row, col = divmod(i, columns)
+        output[
+            row * height : (row + 1) * height, col * width : (col + 1) * width
+        ] = tile
+    return output
+
+
+def save_gallery(
+    modes: Iterable[tuple[float, float, float, float]],
+    fname: str = "chladni_gallery.png",
+    columns: int = 8,
+    width: int = 128,
+    height: int = 128,
+    seed: int | None = None,
+    processes: int | None = None,
+) -> None:
+    """Save Chladni gallery as one mosaic image.
+
+    Args:
+        modes (Iterable[tuple]): (m, n, a, b) parameters of each tile.
+        fname (str, optional): Output file name.
+            Defaults to "chladni_gallery.png".
+        columns (int, optional): Number of columns. Defaults to 8.
+        width (int, optional): Tile width. Defaults to 128.
+        height (int, optional): Tile height. Defaults to 128.
+        seed (int, optional): Sand mask seed. Defaults to None.
+        processes (int, optional): Number of processes. Defaults to None.
+    """
+    tiles = chladni_gallery(modes, width, height, seed, processes)
+    Image.fromarray(mosaic(tiles, columns), "L").save(fname)
+
+
+def save_gallery_tiles(
+    modes: Iterable[tuple[float, float, float, float]],
+    fname: str = "chladni_{index:04d}.png",
+    width: int = 128,
+    height: int = 128,
+    seed: int | None = None,
+    processes: int | None = None,
+) -> None:
+    """Save Chladni gallery as a stream of files.
+
+    Args:
+        modes (Iterable[tuple]): (m, n, a, b) parameters of each tile.
+        fname (str, optional): Output file name pattern, formatted with
+            `index`, `m`, `n`, `a` and `b`. Defaults to "chladni_{index:04d}.png".
+        width (int, optional): Tile width. Defaults to 128.
+        height (int, optional): Tile height. Defaults to 128.
+        seed (int, optional): Sand mask seed. Defaults to None.
+        processes (int, optional): Number of processes. Defaults to None.
+    """
+    modes = list(modes)
+    tiles = chladni_gallery(modes, width, height, seed, processes)
+    for index, ((m, n, a, b), tile) in enumerate(zip(modes, tiles)):
+        Image.fromarray(tile, "L").save(
+            fname.format(index=index, m=m, n=n, a=a, b=b)
+        )
+
+
+class SandSimulation:
+    """Chladni sand particle simulation"""
+
+    def __init__(
+        self,
+        width: int = 512,
+        height: int = 512,
+        m: float = 1,
+        n: float = 1,
+        a: float = 1,
+        b: float = 1,
+        particles: int = 200_000,
+        jitter: float = 2.0,
+        drift: float = 0.5,
+        seed: int | None = None,
+    ) -> None:
+        """Chladni sand particle simulation
+
+        Grains start uniformly on the plate. Every step each grain jitters in
+        proportion to the local plate amplitude and drifts down the amplitude
+        gradient, so sand gathers on the nodal lines.
+
+        Args:
+            width (int, optional): Img width. Defaults to 512.
+            height (int, optional): Img height. Defaults to 512.
+            m (float, optional): m parameter. Defaults to 1.
+            n (float, optional): n parameter. Defaults to 1.
+            a (float, optional): a parameter. Defaults to 1.
+            b (float, optional): b parameter. Defaults to 1.
+            particles (int, optional): Number of grains. Defaults to 200_000.
+            jitter (float, optional): Jitter at maximum amplitude, in pixels.
+                Defaults to 2.0.
+            drift (float, optional): Drift toward nodal lines, in pixels per
+                step at the steepest gradient. Defaults to 0.5.
+            seed (int, optional): Random seed. Defaults to None.
+        """
+        self._width = width
+        self._height = height
+        self._jitter = jitter
+        self._drift = drift
+        self._rng = np.random.default_rng(seed)
+        self._x = self._rng.random(particles, dtype=np.float32) * (width - 1)
+        self._y = self._rng.random(particles, dtype=np.float32) * (height - 1)
+        self._noise = np.empty((2, particles), dtype=np.float32)
+        self._index = np.empty(particles, dtype=np.intp)
+        self.set_mode(m, n, a, b)
+
+    def set_mode(
+        self, m: float = 1, n: float = 1, a: float = 1, b: float = 1
+    ) -> None:
+        """Set plate mode. Amplitude and its gradient are computed once here.
+
+        Args:
+            m (float, optional): m parameter. Defaults to 1.
+            n (float, optional): n parameter. Defaults to 1.
+            a (float, optional): a parameter. Defaults to 1.
+            b (float, optional): b parameter. Defaults to 1.
+        """
+        amplitude = min_max_scaling(
+            chladni_grid(self._width, self._height, m=m, n=n, a=a, b=b)
+        )
+        grad_y, grad_x = np.gradient(amplitude)
+        scale = self._drift / max(np.hypot(grad_x, grad_y).max(), 1e-12)
+        self._amplitude = (amplitude * self._jitter).astype(np.float32).ravel()
+        self._grad_x = (-grad_x * scale).astype(np.float32).ravel()
+        self._grad_y = (-grad_y * scale).astype(np.float32).ravel()
+
+    def step(self, steps: int = 1) -> None:
+        """Advance the simulation.
+
+        Args:
+            steps (int, optional): Number of steps. Defaults to 1.
+        """
+        x, y, noise, index = self._x, self._y, self._noise, self._index
+        for _ in range(steps):
+            # Nearest pixel of every grain
+            np.add(y, 0.5, out=noise[0])
+            np.add(x, 0.5, out=noise[1])
+            index[:] = noise[0]
+            index *= self._width
+            index += noise[1].astype(np.intp)
+
+            self._rng.standard_normal(dtype=np.float32, out=noise)
+            amplitude = self._amplitude[index]
+            noise *= amplitude
+            noise[0] += self._grad_x[index]
+            noise[1] += self._grad_y[index]
+            x += noise[0]
+            y += noise[1]
+            np.clip(x, 0, self._width - 1, out=x)
+            np.clip(y, 0, self._height - 1, out=y)
+
+    def density(self) -> np.ndarray:
+        """Grain density image.
+
+        Returns:
+            np.ndarray: (height, width) grain count per pixel.
+        """
+        index = (self._y + 0.5).astype(np.intp) * self._width
+        index += (self._x + 0.5).astype(np.intp)
+        return np.bincount(
+            index, minlength=self._width * self._height
+        ).reshape(self._height, self._width)
+
+    def image(self) -> np.ndarray:
+        """Grain density image scaled to uint8.
+
+        Returns:
+            np.ndarray: Output array
+        """
+        density = np.log1p(self.density())
+        density /= max(density.max(), 1e-12)
+        return (density * 255).astype(np.uint8)
+
+    def frames(self, count: int, steps: int = 1) -> Iterator[np.ndarray]:
+        """Stream animation frames.
+
+        Args:
+            count (int): Number of frames.
+            steps (int, optional): Steps between frames. Defaults to 1.
+
+        Yields:
+            np.ndarray: uint8 density images.
+        """
+        for _ in range(count):
+            self.step(steps)
+            yield self.image()
+
+
+def circle_mask(width: int = 256, height: int = 256) -> np.ndarray:
+    """Circular plate mask
+
+    Args:
+        width (int, optional): Img width. Defaults to 256.
+        height (int, optional): Img height. Defaults to 256.
+
+    Returns:
+        np.ndarray: Boolean mask
+    """
+    y, x = np.ogrid[-1 : 1 : height * 1j, -1 : 1 : width * 1j]
+    return x**2 + y**2 <= 1
+
+
+def polygon_mask(
+    width: int = 256,
+    height: int = 256,
+    sides: int = 6,
+    rotation: float = 0,
+) -> np.ndarray:
+    """Regular polygon plate mask
+
+    Args:
+        width (int, optional): Img width. Defaults to 256.
+        height (int, optional): Img height. Defaults to 256.
+        sides (int, optional): Number of sides. Defaults to 6.
+        rotation (float, optional): Rotation in radians. Defaults to 0.
+
+    Returns:
+        np.ndarray: Boolean mask
+    """
+    angles = rotation + np.linspace(0, 2 * np.pi, sides, endpoint=False)
+    points = zip(
+        (np.cos(angles) + 1) * (width - 1) / 2,
+        (np.sin(angles) + 1) * (height - 1) / 2,
+    )
+    img = Image.new("1", (width, height))
+    ImageDraw.Draw(img).polygon(list(points), fill=1)
+    return np.asarray(img, dtype=bool)
+
+
+def image_mask(
+    img_path: str,
+    width: int = 256,
+    height: int = 256,
+    threshold: int = 128,
+) -> np.ndarray:
+    """Plate mask from an image. Dark pixels belong to the plate.
+
+    Args:
+        img_path (str): Image path.
+        width (int, optional): Img width. Defaults to 256.
+        height (int, optional): Img height. Defaults to 256.
+        threshold (int, optional): Gray level threshold. Defaults to 128.
+
+    Returns:
+        np.ndarray: Boolean mask
+    """
+    img = Image.open(img_path).convert("L").resize((width, height))
+    return np.asarray(img) < threshold
+
+
+def plate_operator(
+    mask: np.ndarray, biharmonic: bool = True
+) -> sparse.csr_array:
+    """Plate operator on the masked grid
+
+    Graph Laplacian (5-point stencil) over the plate cells with free
+    (Neumann) edges, or its square as the biharmonic operator.
+
+    Args:
+        mask (np.ndarray): Boolean plate mask.
+        biharmonic (bool, optional): Biharmonic operator. Defaults to True.
+
+    Returns:
+        sparse.csr_array: (cells, cells) operator
+    """
+    index = np.full(mask.shape, -1)
+    index[mask] = np.arange(np.count_nonzero(mask))
+    rows, cols = [], []
+    for a, b in (
+        (index[:, :-1], index[:, 1:]),
+        (index[:-1, :], index[1:, :]),
+    ):
+        linked = (a >= 0) & (b >= 0)
+        rows.append(a[linked])
+        cols.append(b[linked])
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    size = index.max() + 1
+    adjacency = sparse.coo_array(
+        (np.ones(len(rows)), (rows, cols)), shape=(size, size)
+    ).tocsr()
+    adjacency = adjacency + adjacency.T
+    degree = sparse.diags_array(np.asarray(adjacency.sum(axis=1)).ravel())
+    laplacian = (degree - adjacency).tocsr()
+    if biharmonic:
+        return (laplacian @ laplacian).tocsr()
+    return laplacian
+
+
+def plate_modes(
+    mask: np.ndarray,
+    count: int = 16,
+    biharmonic: bool = True,
+    cache_dir: str | None = ".chladni_cache",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Lowest eigenmodes of a plate
+
+    Eigenbases are cached on disk, keyed by the mask (shape and resolution)
+    and the operator, so later renders of any mode or mode mix are instant.
+
+    Args:
+        mask (np.ndarray): Boolean plate mask.
+        count (int, optional): Number of modes. Defaults to 16.
+        biharmonic (bool, optional): Biharmonic operator. Defaults to True.
+        cache_dir (str, optional): Cache directory, None disables caching.
+            Defaults to ".chladni_cache".
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Eigenvalues (count,) and modes
+            (count, height, width), zero outside the plate.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    cache_file = None
+    if cache_dir is not None:
+        key = hashlib.sha1(np.packbits(mask).tobytes())
+        key.update(f"{mask.shape}-{biharmonic}".encode())
+        cache_file = Path(cache_dir) / f"{key.hexdigest()}.npz"
+        if cache_file.exists():
+            with np.load(cache_file) as cached:
+                if len(cached["values"]) >= count:
+                    return cached["values"][:count], cached["modes"][:count]
+
+    values, vectors = linalg.eigsh(
+        plate_operator(mask, biharmonic), k=count, sigma=-1e-3, which="LM"
+    )
+    order = np.argsort(values)
+    values = values[order]
+    modes = np.zeros((count, *mask.shape))
+    modes[:, mask] = vectors[:, order].T
+
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(cache_file, values=values, modes=modes)
+    return values, modes
+
+
+def plate_chladni(
+    mask: np.ndarray,
+    mode: int | dict[int, float] = 1,
+    biharmonic: bool = True,
+    cache_dir: str | None = ".chladni_cache",
+) -> np.ndarray:
+    """Chladni figure of an arbitrary plate
+
+    Args:
+        mask (np.ndarray): Boolean plate mask.
+        mode (int | dict[int, float], optional): Mode index, or mode mix as
+            {mode index: weight}. Mode 0 is the flat mode. Defaults to 1.
+        biharmonic (bool, optional): Biharmonic operator. Defaults to True.
+        cache_dir (str, optional): Cache directory, None disables caching.
+            Defaults to ".chladni_cache".
+
+    Returns:
+        np.ndarray: Output array
+    """
+    mix = {mode: 1.0} if isinstance(mode, numbers.Integral) else mode
+    _, modes = plate_modes(mask, max(mix) + 1, biharmonic, cache_dir)
+    results = np.abs(sum(w * modes[i] for i, w in mix.items()))
+    output = _sand(results, np.random.random(mask.shape))
+    output[~mask] = 0
+    return output
 
 
 if __name__ == "__main__":
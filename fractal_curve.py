@@ -7,6 +7,10 @@ Links:
     https://en.wikipedia.org/wiki/Fractal_curve
 """
 
+import math
+from collections.abc import Iterable, Iterator
+
+import drawsvg as dw
 import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
@@ -88,6 +92,25 @@ class FractalCurve:
             raise ValueError("Invalid length of yflip_mask")
         else:
             self._yflip_mask = yflip_mask
+        self._template = self._segment_shape[0] + 1j * self._segment_shape[1]
+
+    def _subdivide(self, points):
+        """Replace every segment of a curve with the segment shape.
+
+        Args:
+            points (np.array): Curve vertices as complex numbers.
+
+        Returns:
+            np.array: Subdivided curve vertices as complex numbers.
+        """
+        segments = points[1:] - points[:-1]
+        flip = np.resize(self._yflip_mask, len(segments))
+        shape = (
+            self._template[:-1].real
+            + 1j * self._template[:-1].imag * flip[:, np.newaxis]
+        )
+        new_points = points[:-1, np.newaxis] + segments[:, np.newaxis] * shape
+        return np.append(new_points.ravel(), self._template[-1])
 
     def generate(self):
         """Generate fractal curve
@@ -95,39 +118,273 @@ class FractalCurve:
         Returns:
             np.array: Fractal curve
         """
+        points = self._fractal_shape[0] + 1j * self._fractal_shape[1]
         for _ in range(self._loops):
-            fractal_shape_temp = []
-            temp_shape = self._fractal_shape.T
-            for i, pt in enumerate(temp_shape):
-                if i == len(temp_shape) - 1:
-                    break
-                vec = temp_shape[i + 1] - pt
-                vec_len = np.linalg.norm(vec)
-                angle = -np.arctan2(*vec) + np.pi / 2
-                scale = (
-                    vec_len,
-                    vec_len * self._yflip_mask[i % self._segments],
-                )
-                new_shape = transform(
-                    self._segment_shape,
-                    translate=pt,
-                    scale=scale,
-                    angle=angle,
-                )
-                fractal_shape_temp.append(new_shape)
-
-            fractal_shape_temp = np.array(fractal_shape_temp)
-            x = np.append(
-                fractal_shape_temp[:, 0, :-1].flatten(),
-                self._segment_shape[0][-1],
-            )
-            y = np.append(
-                fractal_shape_temp[:, 1, :-1].flatten(),
-                self._segment_shape[1][-1],
-            )
-            self._fractal_shape = np.array([x, y])
+            points = self._subdivide(points)
+        self._fractal_shape = np.array([points.real, points.imag])
         return self._fractal_shape
 
+    @property
+    def vertex_count(self) -> int:
+        """Number of vertices of the fractal curve
+
+        Returns:
+            int: Number of vertices
+        """
+        return self._segments ** (self._loops + 1) + 1
+
+    def vertices(self, start, stop):
+        """Vertex range of the fractal curve
+
+        Vertex i is located directly from the base-`segments` digits of i
+        (the bits of i for dragon-type curves): each digit picks a child
+        segment of the segment chosen by the previous digit. No earlier
+        vertices are generated, so disjoint ranges can be computed
+        independently, e.g. in separate processes. The curve is the one
+        returned by the first `generate` call.
+
+        Args:
+            start (int): First vertex index.
+            stop (int): Stop vertex index (exclusive).
+
+        Raises:
+            ValueError: Invalid vertex range.
+
+        Returns:
+            np.array: (2, stop - start) fractal curve vertices
+        """
+        count = self.vertex_count
+        if not 0 <= start <= stop <= count:
+            raise ValueError("Invalid vertex range")
+
+        template = self._template
+        template_diff = np.diff(template)
+        # Segment shape and segment vectors by digit of the parent segment
+        flips = np.asarray(self._yflip_mask)[:, np.newaxis]
+        shapes = template.real + 1j * template.imag * flips
+        shape_diffs = np.diff(shapes, axis=1)
+
+        index = np.arange(start, min(stop, count - 1), dtype=np.int64)
+        points = np.zeros(len(index), dtype=complex)
+        vectors = np.ones(len(index), dtype=complex)
+        levels = self._loops + 1
+        parent = None
+        for level in range(levels):
+            digit = index // self._segments ** (levels - 1 - level)
+            digit %= self._segments
+            if parent is None:
+                points += template[digit]
+                vectors *= template_diff[digit]
+            else:
+                points += vectors * shapes[parent, digit]
+                vectors *= shape_diffs[parent, digit]
+            parent = digit
+
+        if start < stop == count:
+            points = np.append(points, template[-1])
+        return np.array([points.real, points.imag])
+
+    def _expand(self, starts, vectors, flips):
+        """Subdivide independent segments one level.
+
+        Args:
+            starts (np.array): Segment start points as complex numbers.
+            vectors (np.array): Segment vectors as complex numbers.
+            flips (np.array): Segment y flips.
+
+        Returns:
+            tuple: Starts, vectors and y flips of the child segments.
+        """
+        shape = (
+            self._template.real
+            + 1j * self._template.imag * flips[:, np.newaxis]
+        )
+        points = starts[:, np.newaxis] + vectors[:, np.newaxis] * shape
+        return (
+            points[:, :-1].ravel(),
+            np.diff(points, axis=1).ravel(),
+            np.tile(self._yflip_mask, len(starts)),
+        )
+
+    def _walk(self, start, vector, flip, depth, leaf_depth):
+        starts = np.array([start])
+        vectors = np.array([vector])
+        flips = np.array([flip])
+        if depth == leaf_depth:
+            for _ in range(leaf_depth):
+                starts, vectors, flips = self._expand(starts, vectors, flips)
+            yield starts
+            return
+        starts, vectors, flips = self._expand(starts, vectors, flips)
+        for child in zip(starts, vectors, flips):
+            yield from self._walk(*child, depth - 1, leaf_depth)
+
+    def iter_vertices(self, chunk_size=65536) -> Iterator[np.ndarray]:
+        """Generate fractal curve lazily
+
+        Walks the subdivision tree depth-first and expands the deepest levels
+        in vectorized blocks, so memory depends on the depth and chunk size
+        instead of on the number of vertices. The vertices are those of the
+        first `generate` call, in path order.
+
+        Args:
+            chunk_size (int, optional): Target number of vertices per chunk.
+                Defaults to 65536.
+
+        Yields:
+            np.array: (2, n) chunks of the fractal curve.
+        """
+        depth = self._loops
+        if self._segments > 1:
+            leaf_depth = int(math.log(max(chunk_size, 1), self._segments))
+        else:
+            leaf_depth = depth
+        leaf_depth = min(max(leaf_depth, 1), depth)
+
+        template = self._template
+        chunks = (
+            self._walk(start, vector, flip, depth, leaf_depth)
+            for start, vector, flip in zip(
+                template[:-1], np.diff(template), self._yflip_mask
+            )
+        )
+
+        previous = None
+        for chunk in (c for walk in chunks for c in walk):
+            if previous is not None:
+                yield np.array([previous.real, previous.imag])
+            previous = chunk
+        previous = np.append(previous, template[-1])
+        yield np.array([previous.real, previous.imag])
+
+
+def _dedupe(grid):
+    keep = np.ones(grid.shape[1], dtype=bool)
+    keep[1:] = np.any(np.diff(grid, axis=1) != 0, axis=0)
+    return grid[:, keep]
+
+
+def simplify(chunks, step=1.0) -> Iterator[np.ndarray]:
+    """Decimate a stream of curve vertices
+
+    Vertices are snapped to a grid of `step` and repeated vertices are
+    dropped. Vertices within one grid cell of both neighbours are dropped
+    (every other one per pass, until nothing changes), which removes
+    sub-cell wiggles. Finally vertices inside straight runs are dropped.
+    Only the last two kept vertices are carried between chunks.
+
+    Args:
+        chunks (Iterable[np.array]): (2, n) chunks of curve vertices.
+        step (float, optional): Grid step. Defaults to 1.0.
+
+    Yields:
+        np.array: (2, n) chunks of integer grid coordinates.
+    """
+    tail = np.empty((2, 0), dtype=np.int64)
+    for chunk in chunks:
+        grid = np.rint(np.asarray(chunk) / step).astype(np.int64)
+        grid = _dedupe(np.concatenate([tail, grid], axis=1))
+
+        parity, unchanged = 1, 0
+        while unchanged < 2:
+            length = np.abs(np.diff(grid, axis=1)).max(axis=0)
+            drop = np.zeros(grid.shape[1], dtype=bool)
+            drop[1:-1] = (length[:-1] <= 1) & (length[1:] <= 1)
+            drop[1 - parity :: 2] = False
+            unchanged = unchanged + 1 if not drop.any() else 0
+            grid = _dedupe(grid[:, ~drop])
+            parity ^= 1
+
+        delta = np.diff(grid, axis=1)
+        cross = delta[0, :-1] * delta[1, 1:] - delta[1, :-1] * delta[0, 1:]
+        dot = delta[0, :-1] * delta[0, 1:] + delta[1, :-1] * delta[1, 1:]
+        keep = np.ones(grid.shape[1], dtype=bool)
+        keep[1:-1] = (cross != 0) | (dot <= 0)
+        grid = grid[:, keep]
+
+        if grid.shape[1] > 2:
+            yield grid[:, :-2]
+        tail = grid[:, -2:]
+    yield tail
+
+
+def path_data(chunks: Iterable[np.ndarray]) -> str:
+    """SVG path data of integer curve vertices
+
+    Args:
+        chunks (Iterable[np.array]): (2, n) chunks of integer vertices.
+
+    Returns:
+        str: Path data with relative line commands
+    """
+    data = []
+    last = None
+    for chunk in chunks:
+        if chunk.shape[1] == 0:
+            continue
+        if last is None:
+            data.append(f"M{chunk[0, 0]},{chunk[1, 0]}l")
+            last, chunk = chunk[:, :1], chunk[:, 1:]
+        delta = np.diff(np.concatenate([last, chunk], axis=1), axis=1)
+        data.extend(f"{dx},{dy}" for dx, dy in delta.T.tolist())
+        last = chunk[:, -1:] if chunk.shape[1] else last
+    return " ".join(data).replace("l ", "l")
+
+
+def save_svg(
+    fractal_curve: FractalCurve,
+    fname: str = "fractal_curve.svg",
+    width: int = 1024,
+    tolerance: float = 0.5,
+    stroke_width: float = 1.0,
+    margin: int = 8,
+) -> None:
+    """Save fractal curve as SVG
+
+    The curve is streamed twice (bounding box, then path), decimated on a
+    grid of half the tolerance and written with coordinates quantized to
+    that grid, so the file size follows the visible detail instead of the
+    loops. Grid snapping and sub-cell wiggle removal each move the curve by
+    up to about half the tolerance.
+
+    Args:
+        fractal_curve (FractalCurve): Fractal curve.
+        fname (str, optional): Output file name (svg).
+            Defaults to "fractal_curve.svg".
+        width (int, optional): Image width in pixels. Defaults to 1024.
+        tolerance (float, optional): Maximum deviation in pixels.
+            Defaults to 0.5.
+        stroke_width (float, optional): Stroke width in pixels.
+            Defaults to 1.0.
+        margin (int, optional): Margin in pixels. Defaults to 8.
+    """
+    low = np.full(2, np.inf)
+    high = np.full(2, -np.inf)
+    for chunk in fractal_curve.iter_vertices():
+        low = np.minimum(low, chunk.min(axis=1))
+        high = np.maximum(high, chunk.max(axis=1))
+
+    size = high - low
+    scale = (width - 2 * margin) / max(size[0], 1e-12)
+    height = int(np.ceil(size[1] * scale)) + 2 * margin
+    offset = np.array([[margin - low[0] * scale], [margin + high[1] * scale]])
+    flip = np.array([[scale], [-scale]])
+    pixels = (flip * c + offset for c in fractal_curve.iter_vertices())
+
+    step = tolerance / 2
+    d = dw.Drawing(width / step, height / step, id_prefix="pic")
+    d.set_render_size(width, height)
+    d.append(
+        dw.Path(
+            path_data(simplify(pixels, step)),
+            fill="none",
+            stroke="black",
+            stroke_width=stroke_width / step,
+            stroke_linejoin="round",
+        )
+    )
+    d.save_svg(fname)
+
 
 if __name__ == "__main__":
     koch_fractal = FractalCurve(KOCH_SEGMENT_SHAPE, loops=6)
@@ -9,16 +9,17 @@ Links:
 
 """
 
+import colorsys
 import itertools
+import json
+import os
 import random
+from collections.abc import Iterator
+from multiprocessing import Pool
+from pathlib import Path
 
-import matplotlib
-import matplotlib.pyplot as plt
 import numpy as np
 
-matplotlib.use("TkAgg")
-
-
 RIBBON_IFS = [
     [0.2500, -0.2500, 0.2500, 0.2500, 0.0000, 0.0000, 0.25],
     [0.5000, 0.5000, -0.5000, 0.5000, 0.2500, 0.2500, 0.50],
@@ -48,6 +49,11 @@ class IFSToPoints:
         self._functions = [IFSToPoints._generate_f(*i[:-1]) for i in self._ifs]
         self._ps = list(itertools.accumulate((i[-1] for i in self._ifs)))
 
+        ifs = np.asarray(self._ifs, dtype=np.float64)
+        self._matrices = np.stack([ifs[:, [0, 1, 4]], ifs[:, [2, 3, 5]]], 1)
+        self._cumulative = np.cumsum(ifs[:, 6]) / ifs[:, 6].sum()
+        self._cumulative = self._cumulative.astype(np.float32)
+
     @staticmethod
     def _generate_f(a, b, c, d, e, f):
         def _f(x, y):
@@ -79,8 +85,839 @@ class IFSToPoints:
                     break
         return self._list_of_points
 
+    def _choose_maps(self, rng, size):
+        uniform = rng.random(size, dtype=np.float32)
+        maps = np.searchsorted(self._cumulative, uniform, "right")
+        return np.minimum(maps, len(self._cumulative) - 1, out=maps)
+
+    def _coefficients(self, dtype=np.float32):
+        # (6, K) rows a, b, e, c, d, f, gathered per orbit with np.take
+        return self._matrices.reshape(-1, 6).T.astype(dtype)
+
+    @staticmethod
+    def _step(points, maps, coefficients):
+        c = np.take(coefficients, maps, axis=1)
+        x, y = points
+        new_x = c[0] * x
+        new_x += c[1] * y
+        new_x += c[2]
+        c[3] *= x
+        c[4] *= y
+        c[3] += c[4]
+        c[3] += c[5]
+        points[0] = new_x
+        points[1] = c[3]
+
+    def iter_points(
+        self,
+        chunk_size: int = 1_000_000,
+        number_of_points: int | None = None,
+        orbits: int = 100_000,
+        burn_in: int = 20,
+        seed: int | None = None,
+    ) -> Iterator[np.ndarray]:
+        """Generate points in fixed-size chunks.
+
+        Many independent orbits are advanced in parallel. Maps are stacked
+        (K, 2, 3) matrices and are picked for all orbits at once with
+        `np.searchsorted` on uniform random numbers. Orbit state is carried
+        between chunks, so memory does not depend on the number of points.
+
+        Args:
+            chunk_size (int, optional): Number of points per chunk.
+            number_of_points (int, optional): Total number of points. None
+                generates chunks forever.
+            orbits (int, optional): Number of parallel orbits.
+            burn_in (int, optional): Steps dropped while orbits converge.
+            seed (int, optional): Random seed.
+
+        Yields:
+            np.ndarray: (n, 2) float32 points, n <= chunk_size.
+        """
+        rng = np.random.default_rng(seed)
+        orbits = max(min(orbits, chunk_size), 1)
+        coefficients = self._coefficients()
+        points = rng.random((2, orbits), dtype=np.float32)
+        for _ in range(burn_in):
+            self._step(points, self._choose_maps(rng, orbits), coefficients)
+
+        remaining = number_of_points
+        while remaining is None or remaining > 0:
+            size = (
+                chunk_size if remaining is None else min(chunk_size, remaining)
+            )
+            chunk = np.empty((size, 2), dtype=np.float32)
+            for start in range(0, size, orbits):
+                self._step(
+                    points, self._choose_maps(rng, orbits), coefficients
+                )
+                stop = min(start + orbits, size)
+                chunk[start:stop] = points[:, : stop - start].T
+            if remaining is not None:
+                remaining -= size
+            yield chunk
+
+    def generate_array(
+        self,
+        number_of_points: int = 1_000_000,
+        orbits: int = 100_000,
+        burn_in: int = 20,
+        seed: int | None = None,
+    ) -> np.ndarray:
+        """Generate points with many independent orbits in parallel.
+
+        Args:
+            number_of_points (int, optional): Number of points.
+            orbits (int, optional): Number of parallel orbits.
+            burn_in (int, optional): Steps dropped while orbits converge.
+            seed (int, optional): Random seed.
+
+        Returns:
+            np.ndarray: (number_of_points, 2) float32 points.
+        """
+        chunks = self.iter_points(
+            number_of_points, number_of_points, orbits, burn_in, seed
+        )
+        return next(chunks, np.empty((0, 2), dtype=np.float32))
+
+    def _enclosing_bounds(self):
+        """Square around the disc of radius max |t| / (1 - ||A||).
+
+        Every map sends this origin-centred disc into itself, so it holds
+        the attractor.
+        """
+        norms = np.linalg.norm(self._matrices[:, :, :2], ord=2, axis=(1, 2))
+        if norms.max() >= 1:
+            raise ValueError("IFS is not contractive")
+        radius = np.max(np.hypot(*self._matrices[:, :, 2].T) / (1 - norms))
+        radius = max(radius, 1e-9)
+        return (-radius, -radius, radius, radius)
+
+    def attractor(
+        self,
+        width: int = 512,
+        height: int = 512,
+        bounds: tuple[float, float, float, float] | None = None,
+        iterations: int = 64,
+        tolerance: float = 1e-4,
+    ) -> np.ndarray:
+        """Deterministic attractor density on a raster.
+
+        A uniform density is pushed through all maps at once, weighted by
+        the map probabilities, by splatting pixel centres with `np.bincount`
+        until the density stops changing. Only non-empty pixels are mapped,
+        so every pass costs O(attractor pixels * maps).
+
+        Args:
+            width (int, optional): Raster width.
+            height (int, optional): Raster height.
+            bounds (tuple, optional): (x_min, y_min, x_max, y_max) bounds.
+                Defaults to a square that is guaranteed to hold the attractor.
+            iterations (int, optional): Maximum number of passes.
+            tolerance (float, optional): L1 change that stops the iteration.
+
+        Raises:
+            ValueError: IFS is not contractive.
+
+        Returns:
+            np.ndarray: (height, width) density summing to 1, row 0 at y_min.
+        """
+        if bounds is None:
+            bounds = self._enclosing_bounds()
+        x_min, y_min, x_max, y_max = bounds
+        x_step = (x_max - x_min) / width
+        y_step = (y_max - y_min) / height
+        probabilities = np.diff(self._cumulative, prepend=0)[:, np.newaxis]
+        m = self._matrices[:, :, :, np.newaxis]
+
+        density = np.full((height, width), 1 / (width * height))
+        for _ in range(iterations):
+            rows, cols = np.nonzero(density)
+            weights = density[rows, cols] * probabilities
+            x = x_min + (cols + 0.5) * x_step
+            y = y_min + (rows + 0.5) * y_step
+            new_x = m[:, 0, 0] * x + m[:, 0, 1] * y + m[:, 0, 2]
+            new_y = m[:, 1, 0] * x + m[:, 1, 1] * y + m[:, 1, 2]
+            new_cols = np.floor((new_x - x_min) / x_step).astype(np.intp)
+            new_rows = np.floor((new_y - y_min) / y_step).astype(np.intp)
+            inside = (
+                (new_cols >= 0)
+                & (new_cols < width)
+                & (new_rows >= 0)
+                & (new_rows < height)
+            )
+            new_density = np.bincount(
+                new_rows[inside] * width + new_cols[inside],
+                weights[inside],
+                minlength=width * height,
+            ).reshape(height, width)
+            new_density /= max(new_density.sum(), 1e-300)
+            change = np.abs(new_density - density).sum()
+            density = new_density
+            if change < tolerance:
+                break
+        return density
+
+    def attractor_bounds(
+        self, resolution: int = 256
+    ) -> tuple[float, float, float, float]:
+        """Attractor bounding box, e.g. for `Histogram2D` framing.
+
+        Args:
+            resolution (int, optional): Raster resolution of the estimate.
+
+        Raises:
+            ValueError: IFS is not contractive.
+
+        Returns:
+            tuple: (x_min, y_min, x_max, y_max) bounds.
+        """
+        x_min, y_min, x_max, y_max = self._enclosing_bounds()
+        density = self.attractor(resolution, resolution)
+        rows, cols = np.nonzero(density)
+        # One pixel margin for the pixels the raster rounding dropped
+        x_step = (x_max - x_min) / resolution
+        y_step = (y_max - y_min) / resolution
+        return (
+            x_min + (cols.min() - 1) * x_step,
+            y_min + (rows.min() - 1) * y_step,
+            x_min + (cols.max() + 2) * x_step,
+            y_min + (rows.max() + 2) * y_step,
+        )
+
+    def histogram(
+        self,
+        width: int = 512,
+        height: int = 512,
+        number_of_points: int = 10_000_000,
+        chunk_size: int = 1_000_000,
+        seed: int | None = None,
+    ):
+        """Histogram of streamed points, framed by `attractor_bounds`.
+
+        Non-contractive systems fall back to the bounds of the first chunk.
+
+        Args:
+            width (int, optional): Number of x bins.
+            height (int, optional): Number of y bins.
+            number_of_points (int, optional): Number of points.
+            chunk_size (int, optional): Number of points per chunk.
+            seed (int, optional): Random seed.
+
+        Returns:
+            Histogram2D: Histogram.
+        """
+        try:
+            bounds = self.attractor_bounds()
+        except ValueError:
+            bounds = None
+        histogram = Histogram2D(width, height, bounds)
+        for chunk in self.iter_points(chunk_size, number_of_points, seed=seed):
+            histogram.update(chunk)
+        return histogram
+
+
+class Histogram2D:
+    """Bounded-memory 2-D histogram of point chunks"""
+
+    def __init__(
+        self,
+        width: int = 512,
+        height: int = 512,
+        bounds: tuple[float, float, float, float] | None = None,
+    ) -> None:
+        """Histogram 2D
+
+        Args:
+            width (int, optional): Number of x bins.
+            height (int, optional): Number of y bins.
+            bounds (tuple, optional): (x_min, y_min, x_max, y_max). Defaults
+                to the bounds of the first chunk. Points outside are dropped,
+                so prefer `IFSToPoints.attractor_bounds` for IFS points (as
+                `IFSToPoints.histogram` does).
+        """
+        self._width = width
+        self._height = height
+        self._bounds = bounds
+        self._counts = np.zeros(width * height, dtype=np.int64)
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float] | None:
+        """(x_min, y_min, x_max, y_max) bounds."""
+        return self._bounds
+
+    @property
+    def histogram(self) -> np.ndarray:
+        """(height, width) point counts, row 0 at y_min."""
+        return self._counts.reshape(self._height, self._width)
+
+    def update(self, points: np.ndarray) -> None:
+        """Add points.
+
+        Args:
+            points (np.ndarray): (n, 2) points.
+        """
+        if self._bounds is None:
+            low, high = points.min(axis=0), points.max(axis=0)
+            self._bounds = (*low.tolist(), *high.tolist())
+        x_min, y_min, x_max, y_max = self._bounds
+        x = (points[:, 0] - x_min) * (self._width / max(x_max - x_min, 1e-12))
+        y = (points[:, 1] - y_min) * (self._height / max(y_max - y_min, 1e-12))
+        x = np.floor(x).astype(np.intp)
+        y = np.floor(y).astype(np.intp)
+        # Points on the max bound belong to the last bin
+        x[x == self._width] -= 1
+        y[y == self._height] -= 1
+        inside = (x >= 0) & (x < self._width) & (y >= 0) & (y < self._height)
+        self._counts += np.bincount(
+            y[inside] * self._width + x[inside], minlength=self._counts.size
+        )
+
+
+class ReservoirSample:
+    """Uniform fixed-size sample of point chunks (reservoir sampling)"""
+
+    def __init__(self, size: int = 100_000, seed: int | None = None) -> None:
+        """Reservoir sample
+
+        Args:
+            size (int, optional): Sample size.
+            seed (int, optional): Random seed.
+        """
+        self._rng = np.random.default_rng(seed)
+        self._sample = np.empty((size, 2), dtype=np.float32)
+        self._seen = 0
+
+    @property
+    def points(self) -> np.ndarray:
+        """(n, 2) sampled points, n <= size."""
+        return self._sample[: min(self._seen, len(self._sample))]
+
+    def update(self, points: np.ndarray) -> None:
+        """Add points.
+
+        Args:
+            points (np.ndarray): (n, 2) points.
+        """
+        size = len(self._sample)
+        fill = max(min(size - self._seen, len(points)), 0)
+        self._sample[self._seen : self._seen + fill] = points[:fill]
+
+        # Algorithm R: point t replaces a random slot with probability size/t
+        seen = self._seen + np.arange(fill, len(points)) + 1
+        slots = (self._rng.random(len(seen)) * seen).astype(np.int64)
+        accepted = slots < size
+        self._sample[slots[accepted]] = points[fill:][accepted]
+        self._seen += len(points)
+
+
+def _linear(x, y, r2, theta):
+    return x, y
+
+
+def _sinusoidal(x, y, r2, theta):
+    return np.sin(x), np.sin(y)
+
+
+def _spherical(x, y, r2, theta):
+    return x / r2, y / r2
+
+
+def _swirl(x, y, r2, theta):
+    sin, cos = np.sin(r2), np.cos(r2)
+    return x * sin - y * cos, x * cos + y * sin
+
+
+def _horseshoe(x, y, r2, theta):
+    r = np.sqrt(r2)
+    return (x - y) * (x + y) / r, 2 * x * y / r
+
+
+def _polar(x, y, r2, theta):
+    return theta / np.pi, np.sqrt(r2) - 1
+
+
+def _handkerchief(x, y, r2, theta):
+    r = np.sqrt(r2)
+    return r * np.sin(theta + r), r * np.cos(theta - r)
+
+
+def _heart(x, y, r2, theta):
+    r = np.sqrt(r2)
+    return r * np.sin(theta * r), -r * np.cos(theta * r)
+
+
+def _disc(x, y, r2, theta):
+    r = np.sqrt(r2)
+    return theta / np.pi * np.sin(np.pi * r), theta / np.pi * np.cos(np.pi * r)
+
+
+VARIATIONS = {
+    "linear": _linear,
+    "sinusoidal": _sinusoidal,
+    "spherical": _spherical,
+    "swirl": _swirl,
+    "horseshoe": _horseshoe,
+    "polar": _polar,
+    "handkerchief": _handkerchief,
+    "heart": _heart,
+    "disc": _disc,
+}
+
+
+class Flame:
+    """Fractal flame renderer on top of IFS maps"""
+
+    def __init__(
+        self,
+        ifs=None,
+        variations: dict[str, float] | None = None,
+        colors=None,
+    ) -> None:
+        """Fractal flame
+
+        Args:
+            ifs (list, optional): IFS maps. Defaults to random maps.
+            variations (dict, optional): {variation name: weight} applied
+                after the affine maps. Defaults to {"linear": 1}.
+            colors (list, optional): (K, 3) RGB colour in [0, 1] of each map.
+                Defaults to evenly spaced hues.
+        """
+        self._ifs = IFSToPoints.generate_random_ifc() if ifs is None else ifs
+        self._variations = (
+            {"linear": 1.0} if variations is None else variations
+        )
+        for name in self._variations:
+            if name not in VARIATIONS:
+                raise ValueError(f"Unknown variation: {name}")
+        if colors is None:
+            colors = [
+                colorsys.hsv_to_rgb(i / len(self._ifs), 0.8, 1.0)
+                for i in range(len(self._ifs))
+            ]
+        self._colors = np.asarray(colors, dtype=np.float32).T
+
+    def _orbits(self, rng, orbits, burn_in=20):
+        """Yield (points, colors) of all orbits after every step."""
+        ifs_to_points = IFSToPoints(self._ifs)
+        coefficients = ifs_to_points._coefficients()
+        points = rng.random((2, orbits), dtype=np.float32) * 2 - 1
+        colors = np.full((3, orbits), 0.5, dtype=np.float32)
+        step = 0
+        while True:
+            maps = ifs_to_points._choose_maps(rng, orbits)
+            ifs_to_points._step(points, maps, coefficients)
+            x, y = points
+            r2 = x * x + y * y + 1e-9
+            theta = np.arctan2(x, y)
+            new_x = np.zeros_like(x)
+            new_y = np.zeros_like(y)
+            for name, weight in self._variations.items():
+                var_x, var_y = VARIATIONS[name](x, y, r2, theta)
+                new_x += weight * var_x
+                new_y += weight * var_y
+            points[0], points[1] = new_x, new_y
+
+            # Restart orbits that escaped to infinity
+            lost = ~(np.abs(points) < 1e6).all(axis=0)
+            if lost.any():
+                restart = rng.random((2, lost.sum()), dtype=np.float32)
+                points[:, lost] = restart * 2 - 1
+
+            colors += self._colors[:, maps]
+            colors *= 0.5
+            step += 1
+            if step > burn_in:
+                yield points, colors
+
+    def bounds(
+        self,
+        samples: int = 1_000_000,
+        percentile: float = 0.5,
+        seed: int | None = None,
+    ) -> tuple[float, float, float, float]:
+        """Estimate flame bounds from a short run.
+
+        Args:
+            samples (int, optional): Number of samples.
+            percentile (float, optional): Clipped percentile on each side.
+            seed (int, optional): Random seed.
+
+        Returns:
+            tuple: (x_min, y_min, x_max, y_max) bounds.
+        """
+        orbits = min(samples, 100_000)
+        run = self._orbits(np.random.default_rng(seed), orbits)
+        points = np.hstack(
+            [next(run)[0].copy() for _ in range(-(-samples // orbits))]
+        )
+        low = np.percentile(points, percentile, axis=1)
+        high = np.percentile(points, 100 - percentile, axis=1)
+        return (*low.tolist(), *high.tolist())
+
+    def accumulate(
+        self,
+        width: int,
+        height: int,
+        bounds: tuple[float, float, float, float],
+        samples: int,
+        seed=None,
+        orbits: int = 100_000,
+        batch_size: int = 2_000_000,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Accumulate samples into a histogram.
+
+        Samples are binned `batch_size` at a time, so memory is the histogram
+        plus one bounded batch whatever the resolution. Hit counts are
+        float64, exact far beyond 2^24 hits per bin, RGB sums float32.
+
+        Args:
+            width (int): Histogram width.
+            height (int): Histogram height.
+            bounds (tuple): (x_min, y_min, x_max, y_max) bounds.
+            samples (int): Number of samples.
+            seed (optional): Random seed or np.random.SeedSequence.
+            orbits (int, optional): Number of parallel orbits.
+            batch_size (int, optional): Samples binned at once.
+
+        Returns:
+            tuple: (height, width) hit counts and (3, height, width) RGB sums.
+        """
+        size = width * height
+        counts = np.zeros(size, dtype=np.float64)
+        sums = np.zeros((3, size), dtype=np.float32)
+        orbits = max(min(orbits, samples), 1)
+        batch_steps = max(batch_size // orbits, 1)
+        x_min, y_min, x_max, y_max = bounds
+        x_scale = width / (x_max - x_min)
+        y_scale = height / (y_max - y_min)
+
+        run = self._orbits(np.random.default_rng(seed), orbits)
+        steps = -(-samples // orbits)
+        for start in range(0, steps, batch_steps):
+            batch = []
+            for _ in range(min(batch_steps, steps - start)):
+                (x, y), colors = next(run)
+                col = np.floor((x - x_min) * x_scale).astype(np.intp)
+                row = np.floor((y_max - y) * y_scale).astype(np.intp)
+                inside = (
+                    (col >= 0) & (col < width) & (row >= 0) & (row < height)
+                )
+                batch.append(
+                    (row[inside] * width + col[inside], colors[:, inside])
+                )
+            index = np.concatenate([i for i, _ in batch])
+            colors = np.concatenate([c for _, c in batch], axis=1)
+            weights = (None, *colors)
+            for channel, weight in zip((counts, *sums), weights):
+                # A full-size bincount only pays off for dense batches
+                if 4 * len(index) >= size:
+                    channel += np.bincount(index, weight, minlength=size)
+                else:
+                    np.add.at(channel, index, 1 if weight is None else weight)
+        return counts.reshape(height, width), sums.reshape(3, height, width)
+
+    def render(
+        self,
+        width: int = 1920,
+        height: int = 1080,
+        samples: int = 10_000_000,
+        supersample: int = 2,
+        gamma: float = 2.2,
+        bounds: tuple[float, float, float, float] | None = None,
+        processes: int | None = None,
+        seed: int | None = None,
+    ) -> np.ndarray:
+        """Render fractal flame.
+
+        Samples are split across a process pool. Each worker accumulates a
+        supersampled histogram and downsamples it before sending it back, and
+        the partial histograms are summed, so no points are kept. The result
+        is log-density tone mapped and gamma corrected.
+
+        Args:
+            width (int, optional): Image width.
+            height (int, optional): Image height.
+            samples (int, optional): Number of samples.
+            supersample (int, optional): Supersampling factor.
+            gamma (float, optional): Gamma.
+            bounds (tuple, optional): (x_min, y_min, x_max, y_max) bounds.
+                Defaults to `bounds()` padded to the image aspect ratio.
+            processes (int, optional): Number of processes. Defaults to CPU
+                count.
+            seed (int, optional): Random seed.
+
+        Returns:
+            np.ndarray: (height, width, 3) uint8 RGB image.
+        """
+        if bounds is None:
+            x_min, y_min, x_max, y_max = self.bounds(seed=seed)
+            x_mid, y_mid = (x_min + x_max) / 2, (y_min + y_max) / 2
+            half = max((x_max - x_min) / width, (y_max - y_min) / height) / 2
+            half *= 1.05
+            bounds = (
+                x_mid - half * width,
+                y_mid - half * height,
+                x_mid + half * width,
+                y_mid + half * height,
+            )
+
+        processes = processes or os.cpu_count() or 1
+        seeds = np.random.SeedSequence(seed).spawn(processes)
+        shares = [samples // processes] * processes
+        shares[0] += samples % processes
+        tasks = [
+            (self, width, height, supersample, bounds, n, s)
+            for n, s in zip(shares, seeds)
+        ]
+        counts, sums = 0, 0
+        with Pool(processes) as pool:
+            for part_counts, part_sums in pool.imap_unordered(
+                _accumulate_flame, tasks
+            ):
+                counts = counts + part_counts
+                sums = sums + part_sums
+
+        alpha = np.log1p(counts) / max(np.log1p(counts.max()), 1e-12)
+        colors = sums / np.maximum(counts, 1)
+        image = colors * alpha ** (1 / gamma)
+        return (np.moveaxis(image, 0, -1) * 255).clip(0, 255).astype(np.uint8)
+
+
+def _accumulate_flame(args) -> tuple[np.ndarray, np.ndarray]:
+    flame, width, height, supersample, *args = args
+    counts, sums = flame.accumulate(
+        width * supersample, height * supersample, *args
+    )
+    # Downsampled in the worker, so less is sent back
+    return (
+        counts.reshape(height, supersample, width, supersample).sum(
+            axis=(1, 3)
+        ),
+        sums.reshape(3, height, supersample, width, supersample).sum(
+            axis=(2, 4)
+        ),
+    )
+
+
+def random_ifs_batch(count: int, lines: int, rng=None) -> np.ndarray:
+    """Random IFS maps in bulk, like `IFSToPoints.generate_random_ifc`.
+
+    Args:
+        count (int): Number of systems.
+        lines (int): Number of maps per system.
+        rng (np.random.Generator, optional): Random generator.
+
+    Returns:
+        np.ndarray: (count, lines, 7) systems.
+    """
+    rng = np.random.default_rng(rng)
+    batch = rng.random((count, lines, 7)) * 2 - 1
+    ps = rng.random((count, lines))
+    batch[:, :, 6] = ps / ps.sum(axis=1, keepdims=True)
+    return batch
+
+
+def contraction_factors(batch: np.ndarray) -> np.ndarray:
+    """Largest singular value over the maps of every system.
+
+    Args:
+        batch (np.ndarray): (count, lines, 7) systems.
+
+    Returns:
+        np.ndarray: (count,) contraction factors, < 1 when contractive.
+    """
+    linear = batch[:, :, [0, 1, 2, 3]].reshape(*batch.shape[:2], 2, 2)
+    return np.linalg.svd(linear, compute_uv=False)[..., 0].max(axis=1)
+
+
+def score_ifs_batch(
+    batch: np.ndarray,
+    orbits: int = 500,
+    steps: int = 40,
+    scales: int = 6,
+    burn_in: int = 20,
+    rng=None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Box-counting dimension and coverage of every system.
+
+    All systems are iterated together with a short multi-orbit run. Points
+    are normalised to the bounding box of each system and occupied boxes
+    are counted on 2^1 ... 2^scales grids.
+
+    Args:
+        batch (np.ndarray): (count, lines, 7) systems.
+        orbits (int, optional): Number of orbits per system.
+        steps (int, optional): Number of recorded steps.
+        scales (int, optional): Number of box sizes.
+        burn_in (int, optional): Steps dropped while orbits converge.
+        rng (np.random.Generator, optional): Random generator.
+
+    Returns:
+        tuple: (count,) dimensions and (count,) coverage of the finest grid.
+    """
+    rng = np.random.default_rng(rng)
+    count, lines, _ = batch.shape
+    if count == 0:
+        return np.empty(0), np.empty(0)
+    coefficients = batch[:, :, [0, 1, 4, 2, 3, 5]]
+    cumulative = np.cumsum(batch[:, :, 6], axis=1)
+    cumulative /= cumulative[:, -1:]
+    systems = np.arange(count)[:, np.newaxis]
+
+    points = rng.random((2, count, orbits))
+    record = np.empty((steps, 2, count, orbits))
+    for step in range(burn_in + steps):
+        uniform = rng.random((count, orbits, 1))
+        maps = (uniform >= cumulative[:, np.newaxis, :]).sum(axis=2)
+        np.minimum(maps, lines - 1, out=maps)
+        c = np.moveaxis(coefficients[systems, maps], -1, 0)
+        x, y = points
+        points = np.array(
+            [c[0] * x + c[1] * y + c[2], c[3] * x + c[4] * y + c[5]]
+        )
+        if step >= burn_in:
+            record[step - burn_in] = points
+
+    points = record.transpose(2, 1, 0, 3).reshape(count, 2, -1)
+    low = points.min(axis=2, keepdims=True)
+    size = np.ptp(points, axis=2, keepdims=True)
+    unit = (points - low) / np.maximum(size, 1e-12)
+    unit = np.clip(unit, 0, 1 - 1e-9)
+
+    counts = np.empty((scales, count))
+    for scale in range(1, scales + 1):
+        cells = (unit * 2**scale).astype(np.int64)
+        codes = systems * 4**scale + cells[:, 0] * 2**scale + cells[:, 1]
+        occupied = np.unique(codes) // 4**scale
+        counts[scale - 1] = np.bincount(occupied, minlength=count)
+
+    dimensions = np.polyfit(np.arange(1, scales + 1), np.log2(counts), 1)[0]
+    # Degenerate systems collapse to a point or a (possibly diagonal) line:
+    # the spread of the last steps along their principal axes is tiny
+    # against the whole extent, or the minor axis against the major one
+    late = record[steps // 2 :].transpose(2, 1, 0, 3).reshape(count, 2, -1)
+    late = late - late.mean(axis=2, keepdims=True)
+    covariance = late @ late.transpose(0, 2, 1) / late.shape[2]
+    minor, major = np.sqrt(np.maximum(np.linalg.eigvalsh(covariance), 0)).T
+    extent = size.max(axis=(1, 2))
+    degenerate = ~(major >= 1e-3 * extent) | ~(minor >= 1e-3 * major)
+    dimensions[degenerate] = 0
+    return dimensions, counts[-1] / 4**scales
+
+
+def _search_batch(args) -> list[dict]:
+    count, lines, max_norm, min_coverage, max_coverage, seed = args
+    rng = np.random.default_rng(seed)
+    if lines is None:
+        lines = int(rng.integers(2, 5))
+    batch = random_ifs_batch(count, lines, rng)
+    batch = batch[contraction_factors(batch) < max_norm]
+    with np.errstate(all="ignore"):
+        dimensions, coverage = score_ifs_batch(batch, rng=rng)
+    keep = (coverage >= min_coverage) & (coverage <= max_coverage)
+    keep &= dimensions > 0
+    return [
+        {"score": float(d), "coverage": float(c), "ifs": ifs.tolist()}
+        for d, c, ifs in zip(dimensions[keep], coverage[keep], batch[keep])
+    ]
+
+
+class IFSSearch:
+    """Parallel random IFS search with a persistent leaderboard"""
+
+    def __init__(
+        self,
+        leaderboard: str = "ifs_leaderboard.json",
+        size: int = 50,
+        max_norm: float = 0.95,
+        min_coverage: float = 0.02,
+        max_coverage: float = 0.5,
+    ) -> None:
+        """IFS search
+
+        Candidates must be contractive (largest singular value below
+        `max_norm`) and cover a limited part of their bounding box, which
+        drops points, lines and filled blobs. Survivors are ranked by
+        box-counting dimension.
+
+        Args:
+            leaderboard (str, optional): Leaderboard file (json).
+            size (int, optional): Leaderboard size.
+            max_norm (float, optional): Maximum contraction factor.
+            min_coverage (float, optional): Minimum box coverage.
+            max_coverage (float, optional): Maximum box coverage.
+        """
+        self._path = Path(leaderboard)
+        self._size = size
+        self._max_norm = max_norm
+        self._min_coverage = min_coverage
+        self._max_coverage = max_coverage
+        self._leaderboard = []
+        if self._path.exists():
+            self._leaderboard = json.loads(self._path.read_text())
+
+    @property
+    def leaderboard(self) -> list[dict]:
+        """Best systems as {"score", "coverage", "ifs"}, best first."""
+        return self._leaderboard
+
+    def run(
+        self,
+        candidates: int = 10_000,
+        lines: int | None = None,
+        batch_size: int = 250,
+        processes: int | None = None,
+        seed: int | None = None,
+    ) -> list[dict]:
+        """Search random systems and update the leaderboard.
+
+        Args:
+            candidates (int, optional): Number of candidates.
+            lines (int, optional): Number of maps per system. Defaults to a
+                random 2-4 per batch.
+            batch_size (int, optional): Candidates per process task.
+            processes (int, optional): Number of processes.
+            seed (int, optional): Random seed.
+
+        Returns:
+            list[dict]: Leaderboard.
+        """
+        batches = -(-candidates // batch_size)
+        seeds = np.random.SeedSequence(seed).spawn(batches)
+        tasks = [
+            (
+                min(batch_size, candidates - i * batch_size),
+                lines,
+                self._max_norm,
+                self._min_coverage,
+                self._max_coverage,
+                s,
+            )
+            for i, s in enumerate(seeds)
+        ]
+        with Pool(processes) as pool:
+            for results in pool.imap_unordered(_search_batch, tasks):
+                self._leaderboard.extend(results)
+
+        # Runs with the same seed find the same systems again
+        unique = {
+            tuple(map(tuple, entry["ifs"])): entry
+            for entry in self._leaderboard
+        }
+        self._leaderboard = list(unique.values())
+        self._leaderboard.sort(key=lambda entry: entry["score"], reverse=True)
+        del self._leaderboard[self._size :]
+        self._path.write_text(json.dumps(self._leaderboard))
+        return self._leaderboard
+
 
 if __name__ == "__main__":
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    matplotlib.use("TkAgg")
+
     ifs_to_pts = IFSToPoints(DRAGON_IFS)
     pts = ifs_to_pts.generate(number_of_points=10000)
     pts = np.array(pts).T
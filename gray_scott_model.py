@@ -9,14 +9,75 @@ Links:
     https://www.mrob.com/pub/comp/xmorphia/index.html
 """
 
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import shared_memory
 
-import matplotlib
-import matplotlib.animation as animation
-import matplotlib.pyplot as plt
 import numpy as np
-from scipy import ndimage
+from PIL import Image
+from scipy import fft
 
-matplotlib.use("TkAgg")
+
+def _fill_halo(padded: np.ndarray) -> None:
+    """Fill one-cell halo by edge reflection (`ndimage.laplace` default)."""
+    padded[0, 1:-1] = padded[1, 1:-1]
+    padded[-1, 1:-1] = padded[-2, 1:-1]
+    padded[:, 0] = padded[:, 1]
+    padded[:, -1] = padded[:, -2]
+
+
+def _laplace(
+    padded: np.ndarray, out: np.ndarray, scratch: np.ndarray
+) -> np.ndarray:
+    """5-point Laplacian of the interior of a padded array.
+
+    Leading axes are batch axes, e.g. a stack of tiles.
+
+    Args:
+        padded (np.ndarray): Array with a one-cell halo.
+        out (np.ndarray): Output array, shape of the interior.
+        scratch (np.ndarray): Scratch array, shape of the interior.
+
+    Returns:
+        np.ndarray: out
+    """
+    np.add(padded[..., :-2, 1:-1], padded[..., 2:, 1:-1], out=out)
+    out += padded[..., 1:-1, :-2]
+    out += padded[..., 1:-1, 2:]
+    np.multiply(padded[..., 1:-1, 1:-1], 4, out=scratch)
+    out -= scratch
+    return out
+
+
+def _step(padded_u, padded_v, lap, uvv, d_u, d_v, f, f_k) -> None:
+    """One in-place step on padded arrays with filled halos.
+
+    Parameters are scalars or arrays of the interior shape, `f_k` is f + k.
+    """
+    u = padded_u[..., 1:-1, 1:-1]
+    v = padded_v[..., 1:-1, 1:-1]
+
+    # U, with the old U and V
+    _laplace(padded_u, lap, uvv)
+    lap *= d_u
+    np.multiply(v, v, out=uvv)
+    uvv *= u
+    lap -= uvv
+    np.subtract(1, u, out=uvv)
+    uvv *= f
+    lap += uvv
+    u += lap
+
+    # V, with the new U
+    _laplace(padded_v, lap, uvv)
+    lap *= d_v
+    np.multiply(v, v, out=uvv)
+    uvv *= u
+    lap += uvv
+    np.multiply(v, f_k, out=uvv)
+    lap -= uvv
+    v += lap
 
 
 class GrayScottModel:
@@ -26,29 +87,38 @@ class GrayScottModel:
         self,
         width: int = 50,
         height: int = 50,
-        d_u: float = 0.01,
-        d_v: float = 0.005,
-        f: float = 0.029,
-        k: float = 0.057,
+        d_u: float | np.ndarray = 0.01,
+        d_v: float | np.ndarray = 0.005,
+        f: float | np.ndarray = 0.029,
+        k: float | np.ndarray = 0.057,
         initiate_randomly: bool = False,
+        dtype: np.dtype = np.float64,
     ) -> None:
         """Gray-Scott Model
 
+        Each of d_u, d_v, f and k is a scalar or a (height, width) array, so
+        one simulation can sweep a whole parameter plane (see `gradient`).
+
         Args:
             width (int, optional): Sample width. Defaults to 50.
             height (int, optional): Sample height. Defaults to 50.
-            d_u (float, optional): U diffusion rate. Defaults to 0.01.
-            d_v (float, optional): V diffusion rate. Defaults to 0.005.
-            f (float, optional): Feed rate. Defaults to 0.029.
-            k (float, optional): Kill rate. Defaults to 0.057.
+            d_u (float | np.ndarray, optional): U diffusion rate. Defaults to 0.01.
+            d_v (float | np.ndarray, optional): V diffusion rate. Defaults to 0.005.
+            f (float | np.ndarray, optional): Feed rate. Defaults to 0.029.
+            k (float | np.ndarray, optional): Kill rate. Defaults to 0.057.
             initiate_randomly (bool, optional): Initiate randomly. Defaults to False.
+            dtype (np.dtype, optional): Data type. Defaults to np.float64.
         """
         self._width = width
         self._height = height
-        self._d_u = d_u
-        self._d_v = d_v
-        self._f = f
-        self._k = k
+        self._dtype = np.dtype(dtype)
+        self._spectral_cache = (None, None)
+        self._step_count = 0
+        self._d_u = self._parameter(d_u)
+        self._d_v = self._parameter(d_v)
+        self._f = self._parameter(f)
+        self._k = self._parameter(k)
+        self._f_k = self._f + self._k
         if initiate_randomly:
             mask = np.random.random((height, width))
             mask = mask < 0.3
@@ -59,11 +129,25 @@ class GrayScottModel:
             ] = True
         self._apply_mask(mask)
 
+    def _parameter(self, value):
+        if np.ndim(value) == 0:
+            return float(value)
+        return np.broadcast_to(
+            np.asarray(value, dtype=self._dtype), (self._height, self._width)
+        )
+
     def _apply_mask(self, mask):
-        self._u = np.ones((self._height, self._width))
-        self._v = np.zeros((self._height, self._width))
+        # Padded with a one-cell halo for the stencil
+        shape = (self._height + 2, self._width + 2)
+        self._padded_u = np.ones(shape, dtype=self._dtype)
+        self._padded_v = np.zeros(shape, dtype=self._dtype)
+        self._u = self._padded_u[1:-1, 1:-1]
+        self._v = self._padded_v[1:-1, 1:-1]
         self._u[mask] = 0
         self._v[mask] = 1
+        # Scratch buffers reused by every step
+        self._lap = np.empty_like(self._u)
+        self._uvv = np.empty_like(self._u)
 
     @property
     def u(self) -> np.ndarray:
@@ -83,59 +167,621 @@ class GrayScottModel:
         """
         return (self._v - self._v.min()) / (self._v.max() - self._v.min())
 
+    @property
+    def step_count(self) -> int:
+        """Number of computed steps
+
+        Returns:
+            int: Number of computed steps
+        """
+        return self._step_count
+
+    def save_checkpoint(self, fname: str) -> None:
+        """Save the full model state.
+
+        Args:
+            fname (str): Output file name (npz).
+        """
+        np.savez(
+            fname,
+            u=self._u,
+            v=self._v,
+            d_u=self._d_u,
+            d_v=self._d_v,
+            f=self._f,
+            k=self._k,
+            step_count=self._step_count,
+        )
+
+    @classmethod
+    def load_checkpoint(cls, fname: str, **kwargs):
+        """Load a model saved with `save_checkpoint`.
+
+        Args:
+            fname (str): Checkpoint file name (npz).
+            **kwargs: Extra constructor arguments, e.g. processes.
+
+        Returns:
+            GrayScottModel: Gray-Scott Model
+        """
+        with np.load(fname) as checkpoint:
+            u, v = checkpoint["u"], checkpoint["v"]
+            height, width = u.shape
+            gray_scott_model = cls(
+                width,
+                height,
+                checkpoint["d_u"],
+                checkpoint["d_v"],
+                checkpoint["f"],
+                checkpoint["k"],
+                dtype=u.dtype,
+                **kwargs,
+            )
+            gray_scott_model._u[...] = u
+            gray_scott_model._v[...] = v
+            gray_scott_model._step_count = int(checkpoint["step_count"])
+        return gray_scott_model
+
+    def run(self, steps: int, writer=None, every: int = 100) -> None:
+        """Compute many steps, writing a snapshot every few steps.
+
+        Args:
+            steps (int): Number of steps.
+            writer (SnapshotWriter, optional): Snapshot writer. Defaults to
+                None.
+            every (int, optional): Steps between snapshots. Defaults to 100.
+        """
+        for start in range(0, steps, every):
+            self.compute(min(every, steps - start))
+            if writer is not None:
+                writer.write(self)
+
     @classmethod
     def from_mask(
         cls,
         mask: np.ndarray,
-        d_u: float = 0.01,
-        d_v: float = 0.005,
-        f: float = 0.029,
-        k: float = 0.057,
+        d_u: float | np.ndarray = 0.01,
+        d_v: float | np.ndarray = 0.005,
+        f: float | np.ndarray = 0.029,
+        k: float | np.ndarray = 0.057,
+        dtype: np.dtype = np.float64,
+        **kwargs,
     ):
         """Create Gray-Scott Model from mask.
 
         Args:
             mask (np.ndarray): Mask.
-            d_u (float, optional): U diffusion rate. Defaults to 0.01.
-            d_v (float, optional): V diffusion rate. Defaults to 0.005.
-            f (float, optional): Feed rate. Defaults to 0.029.
-            k (float, optional): Kill rate. Defaults to 0.057.
+            d_u (float | np.ndarray, optional): U diffusion rate. Defaults to 0.01.
+            d_v (float | np.ndarray, optional): V diffusion rate. Defaults to 0.005.
+            f (float | np.ndarray, optional): Feed rate. Defaults to 0.029.
+            k (float | np.ndarray, optional): Kill rate. Defaults to 0.057.
+            dtype (np.dtype, optional): Data type. Defaults to np.float64.
+            **kwargs: Extra constructor arguments, e.g. processes.
 
         Returns:
             GrayScottModel: Gray-Scott Model
         """
         height, width = mask.shape
-        gray_scott_model = cls(width, height, d_u, d_v, f, k)
+        gray_scott_model = cls(
+            width, height, d_u, d_v, f, k, dtype=dtype, **kwargs
+        )
         gray_scott_model._apply_mask(mask)
         return gray_scott_model
 
-    def compute(self):
-        """Compute Gray-Scott Model"""
-        self._u += (
-            self._d_u * ndimage.laplace(self._u)
-            - self._u * self._v * self._v
-            + self._f * (1 - self._u)
+    def compute(self, steps: int = 1):
+        """Compute Gray-Scott Model
+
+        Steps run in place on preallocated buffers, without temporaries.
+
+        Args:
+            steps (int, optional): Number of steps. Defaults to 1.
+        """
+        self._step_count += steps
+        for _ in range(steps):
+            _fill_halo(self._padded_u)
+            _fill_halo(self._padded_v)
+            _step(
+                self._padded_u,
+                self._padded_v,
+                self._lap,
+                self._uvv,
+                self._d_u,
+                self._d_v,
+                self._f,
+                self._f_k,
+            )
+
+    def _tile_starts(self, tile: int) -> tuple[np.ndarray, np.ndarray]:
+        # The last tile of a row or column is shifted back inside the grid
+        rows = np.minimum(
+            np.arange(0, self._height, tile), self._height - tile
+        )
+        cols = np.minimum(np.arange(0, self._width, tile), self._width - tile)
+        return rows, cols
+
+    def _busy_tiles(self, tile: int) -> np.ndarray:
+        """Tiles holding any cell away from the rest state (u=1, v=0)."""
+        busy = (self._u != 1) | (self._v != 0)
+        busy = np.logical_or.reduceat(busy, np.arange(0, self._height, tile))
+        return np.logical_or.reduceat(
+            busy, np.arange(0, self._width, tile), axis=1
+        )
+
+    def compute_active(self, steps: int = 1, tile: int = 32):
+        """Compute Gray-Scott Model on active tiles only
+
+        A cell at rest (u=1, v=0) with resting neighbours stays at rest, and
+        activity spreads at most one cell per step. So every `tile` steps the
+        tiles away from rest, grown by one tile of halo, are collected, and
+        only those are stepped until the next check. The result matches
+        `compute` exactly, while sparse patterns (a few seeds on a large
+        canvas) cost in proportion to their area.
+
+        Args:
+            steps (int, optional): Number of steps. Defaults to 1.
+            tile (int, optional): Tile size. Defaults to 32.
+        """
+        tile = min(tile, self._height, self._width)
+        tile_rows, tile_cols = self._tile_starts(tile)
+        busy = self._busy_tiles(tile)
+        offsets = np.arange(tile + 2)
+        done = 0
+        while done < steps:
+            # Grow by one tile, the reach of `tile` steps
+            padded = np.pad(busy, 1)
+            active = np.zeros_like(busy)
+            for dy in range(3):
+                for dx in range(3):
+                    active |= padded[
+                        dy : dy + busy.shape[0], dx : dx + busy.shape[1]
+                    ]
+            index_y, index_x = np.nonzero(active)
+            if len(index_y) == 0:
+                break
+            # Padded indices of each tile with its halo
+            rows = (tile_rows[index_y, None] + offsets)[:, :, None]
+            cols = (tile_cols[index_x, None] + offsets)[:, None, :]
+            inner = rows[:, 1:-1], cols[:, :, 1:-1]
+            parameters = [
+                p if np.ndim(p) == 0 else p[inner[0] - 1, inner[1] - 1]
+                for p in (self._d_u, self._d_v, self._f, self._f_k)
+            ]
+            lap = np.empty((len(index_y), tile, tile), dtype=self._dtype)
+            uvv = np.empty_like(lap)
+            for _ in range(min(tile, steps - done)):
+                _fill_halo(self._padded_u)
+                _fill_halo(self._padded_v)
+                # Gather before stepping, shifted edge tiles may overlap
+                tiles_u = self._padded_u[rows, cols]
+                tiles_v = self._padded_v[rows, cols]
+                _step(tiles_u, tiles_v, lap, uvv, *parameters)
+                self._padded_u[inner] = tiles_u[:, 1:-1, 1:-1]
+                self._padded_v[inner] = tiles_v[:, 1:-1, 1:-1]
+                done += 1
+            # Tiles outside the active set are still at rest
+            busy = np.zeros_like(active)
+            busy[index_y, index_x] = (tiles_u[:, 1:-1, 1:-1] != 1).any(
+                axis=(1, 2)
+            ) | (tiles_v[:, 1:-1, 1:-1] != 0).any(axis=(1, 2))
+        self._step_count += steps
+
+    def _spectral_linear_reaction(self) -> bool:
+        """Feed and kill are uniform, so they join the exact linear part."""
+        return np.ndim(self._f) == 0 and np.ndim(self._k) == 0
+
+    def _spectral_reaction(self, u, v) -> tuple:
+        """Terms of the reaction integrated explicitly."""
+        uvv = u * v * v
+        if self._spectral_linear_reaction():
+            return fft.rfft2(self._f - uvv), fft.rfft2(uvv)
+        return (
+            fft.rfft2(self._f * (1 - u) - uvv),
+            fft.rfft2(uvv - self._f_k * v),
+        )
+
+    def _spectral_factors(self, dt: float) -> tuple:
+        """ETD factors of the linear (diffusion, feed and kill) terms."""
+        if np.ndim(self._d_u) or np.ndim(self._d_v):
+            raise ValueError("Spectral integrator needs uniform diffusion")
+        if self._spectral_cache[0] != dt:
+            k_y = 2 * np.pi * np.fft.fftfreq(self._height)[:, np.newaxis]
+            k_x = 2 * np.pi * np.fft.rfftfreq(self._width)[np.newaxis, :]
+            # Symbol of the 5-point Laplacian, so patterns match `compute`
+            symbol = 2 * np.cos(k_x) + 2 * np.cos(k_y) - 4
+            linear_u, linear_v = self._d_u * symbol, self._d_v * symbol
+            if self._spectral_linear_reaction():
+                linear_u = linear_u - self._f
+                linear_v = linear_v - self._f_k
+            factors = []
+            for linear in (linear_u, linear_v):
+                exp = np.exp(dt * linear)
+                nonzero = np.where(linear != 0, linear, 1)
+                phi_1 = np.where(linear != 0, (exp - 1) / nonzero, dt)
+                phi_2 = np.where(
+                    linear != 0,
+                    (exp - 1 - dt * linear) / (dt * nonzero**2),
+                    dt / 2,
+                )
+                factors.extend(
+                    x.astype(self._dtype) for x in (exp, phi_1, phi_2)
+                )
+            self._spectral_cache = (dt, factors)
+        return self._spectral_cache[1]
+
+    def compute_spectral(self, steps: int = 1, dt: float = 1.0):
+        """Compute Gray-Scott Model with a spectral integrator
+
+        Diffusion and the linear feed and kill terms are integrated exactly
+        in Fourier space, the u*v*v reaction explicitly (ETD2RK), on periodic
+        boundaries. Stable and accurate for much larger steps than
+        `compute`, e.g. dt=10 gives the same patterns with 10x fewer steps.
+        Feed and kill maps are integrated explicitly with the reaction;
+        diffusion rates must be uniform.
+
+        Args:
+            steps (int, optional): Number of steps. Defaults to 1.
+            dt (float, optional): Time step. Defaults to 1.0.
+        """
+        e_u, p1_u, p2_u, e_v, p1_v, p2_v = self._spectral_factors(dt)
+        self._step_count += steps
+        shape = self._u.shape
+        u, v = self._u, self._v
+        spectrum_u, spectrum_v = fft.rfft2(u), fft.rfft2(v)
+        for _ in range(steps):
+            n_u, n_v = self._spectral_reaction(u, v)
+            a_u = e_u * spectrum_u + p1_u * n_u
+            a_v = e_v * spectrum_v + p1_v * n_v
+            u, v = fft.irfft2(a_u, s=shape), fft.irfft2(a_v, s=shape)
+            m_u, m_v = self._spectral_reaction(u, v)
+            spectrum_u = a_u + p2_u * (m_u - n_u)
+            spectrum_v = a_v + p2_v * (m_v - n_v)
+            u = fft.irfft2(spectrum_u, s=shape)
+            v = fft.irfft2(spectrum_v, s=shape)
+        self._u[...] = u
+        self._v[...] = v
+
+
+def _strip_worker(
+    index, workers, rows, width, dtype, names, params, barriers
+) -> None:
+    """Step one strip of a `ParallelGrayScottModel` in a worker process."""
+    start_barrier, step_barrier, done_barrier = barriers
+    memory = [shared_memory.SharedMemory(name=name) for name in names]
+    state_shm, edges_shm, control_shm = memory
+    height = rows[-1]
+    state = np.ndarray((2, height + 2, width + 2), dtype, state_shm.buf)
+    # Edge rows by step parity, field, strip and side (top, bottom)
+    edges = np.ndarray((2, 2, workers, 2, width + 2), dtype, edges_shm.buf)
+    control = np.ndarray(2, np.int64, control_shm.buf)
+
+    top, bottom = rows[index] + 1, rows[index + 1] + 1
+    local = np.empty((2, bottom - top + 2, width + 2), dtype=dtype)
+    lap = np.empty((bottom - top, width), dtype=dtype)
+    uvv = np.empty_like(lap)
+
+    while True:
+        start_barrier.wait()
+        command, steps = control
+        if command == 0:
+            break
+        local[:, 1:-1] = state[:, top:bottom]
+        for step in range(steps):
+            parity = step % 2
+            edges[parity, :, index, 0] = local[:, 1]
+            edges[parity, :, index, 1] = local[:, -2]
+            step_barrier.wait()
+            # Halo exchange with the neighbour strips, reflection at the edges
+            if index > 0:
+                local[:, 0] = edges[parity, :, index - 1, 1]
+            else:
+                local[:, 0] = local[:, 1]
+            if index < workers - 1:
+                local[:, -1] = edges[parity, :, index + 1, 0]
+            else:
+                local[:, -1] = local[:, -2]
+            local[:, :, 0] = local[:, :, 1]
+            local[:, :, -1] = local[:, :, -2]
+            _step(local[0], local[1], lap, uvv, *params)
+        state[:, top:bottom] = local[:, 1:-1]
+        done_barrier.wait()
+
+    del state, edges, control
+    for shm in memory:
+        shm.close()
+
+
+class ParallelGrayScottModel(GrayScottModel):
+    """Gray-Scott Model stepped by worker processes on horizontal strips"""
+
+    def __init__(
+        self,
+        width: int = 50,
+        height: int = 50,
+        d_u: float | np.ndarray = 0.01,
+        d_v: float | np.ndarray = 0.005,
+        f: float | np.ndarray = 0.029,
+        k: float | np.ndarray = 0.057,
+        initiate_randomly: bool = False,
+        dtype: np.dtype = np.float64,
+        processes: int | None = None,
+    ) -> None:
+        """Parallel Gray-Scott Model
+
+        U and V live in `multiprocessing.shared_memory`. Each worker keeps
+        a strip of rows, exchanges one-cell halo rows with its neighbours
+        through shared memory every step and synchronises on a barrier.
+        Results match `GrayScottModel.compute`. Call `close` (or use as a
+        context manager) to stop the workers and free the shared memory.
+
+        Args:
+            width (int, optional): Sample width. Defaults to 50.
+            height (int, optional): Sample height. Defaults to 50.
+            d_u (float | np.ndarray, optional): U diffusion rate. Defaults to 0.01.
+            d_v (float | np.ndarray, optional): V diffusion rate. Defaults to 0.005.
+            f (float | np.ndarray, optional): Feed rate. Defaults to 0.029.
+            k (float | np.ndarray, optional): Kill rate. Defaults to 0.057.
+            initiate_randomly (bool, optional): Initiate randomly. Defaults to False.
+            dtype (np.dtype, optional): Data type. Defaults to np.float64.
+            processes (int, optional): Number of workers. Defaults to CPU
+                count, at most one per row.
+        """
+        self._processes = min(processes or os.cpu_count() or 1, height)
+        self._shared = []
+        self._workers = []
+        super().__init__(
+            width, height, d_u, d_v, f, k, initiate_randomly, dtype
         )
-        self._v += (
-            self._d_v * ndimage.laplace(self._v)
-            + self._u * self._v * self._v
-            - (self._f + self._k) * self._v
+
+    def _apply_mask(self, mask):
+        if not self._shared:
+            shape = (2, self._height + 2, self._width + 2)
+            size = int(np.prod(shape)) * self._dtype.itemsize
+            self._shared = [shared_memory.SharedMemory(create=True, size=size)]
+            state = np.ndarray(shape, self._dtype, self._shared[0].buf)
+            self._padded_u, self._padded_v = state
+            self._u = self._padded_u[1:-1, 1:-1]
+            self._v = self._padded_v[1:-1, 1:-1]
+            self._lap = np.empty_like(self._u)
+            self._uvv = np.empty_like(self._u)
+        # Shared with the workers, so always rewritten in place
+        self._padded_u[...] = 1
+        self._padded_v[...] = 0
+        self._u[mask] = 0
+        self._v[mask] = 1
+
+    def _start(self) -> None:
+        workers = self._processes
+        edges_size = 2 * 2 * workers * 2 * (self._width + 2)
+        self._shared += [
+            shared_memory.SharedMemory(
+                create=True, size=edges_size * self._dtype.itemsize
+            ),
+            shared_memory.SharedMemory(create=True, size=16),
+        ]
+        self._control = np.ndarray(2, np.int64, self._shared[2].buf)
+        self._start_barrier = mp.Barrier(workers + 1)
+        self._done_barrier = mp.Barrier(workers + 1)
+        barriers = (
+            self._start_barrier,
+            mp.Barrier(workers),
+            self._done_barrier,
         )
+        rows = np.linspace(0, self._height, workers + 1).astype(int).tolist()
+        names = [shm.name for shm in self._shared]
+        for index in range(workers):
+            # Parameter maps are sliced to the strip of the worker
+            params = tuple(
+                p if np.ndim(p) == 0 else p[rows[index] : rows[index + 1]]
+                for p in (self._d_u, self._d_v, self._f, self._f_k)
+            )
+            worker = mp.Process(
+                target=_strip_worker,
+                args=(
+                    index,
+                    workers,
+                    rows,
+                    self._width,
+                    self._dtype,
+                    names,
+                    params,
+                    barriers,
+                ),
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def compute(self, steps: int = 1):
+        """Compute Gray-Scott Model in the worker processes
+
+        Args:
+            steps (int, optional): Number of steps. Defaults to 1.
+        """
+        if not self._workers:
+            self._start()
+        self._step_count += steps
+        self._control[:] = (1, steps)
+        self._start_barrier.wait()
+        self._done_barrier.wait()
+
+    def _release_shared(self) -> None:
+        for shm in self._shared:
+            shm.close()
+            shm.unlink()
+        self._shared = []
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory."""
+        if self._workers:
+            self._control[:] = (0, 0)
+            self._start_barrier.wait()
+            for worker in self._workers:
+                worker.join()
+            self._workers = []
+        # Views must be dropped before the shared memory can be closed
+        self._padded_u = self._padded_v = self._u = self._v = None
+        self._control = None
+        self._release_shared()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def gradient(
+    width: int,
+    height: int,
+    start: float,
+    end: float,
+    axis: int = 1,
+) -> np.ndarray:
+    """Linear parameter gradient, e.g. for an (f, k) parameter map.
+
+    Args:
+        width (int): Sample width.
+        height (int): Sample height.
+        start (float): Value at the first column (axis=1) or row (axis=0).
+        end (float): Value at the last column (axis=1) or row (axis=0).
+        axis (int, optional): Gradient axis. Defaults to 1.
+
+    Returns:
+        np.ndarray: (height, width) parameter map
+    """
+    values = np.linspace(start, end, (height, width)[axis])
+    if axis == 0:
+        values = values[:, np.newaxis]
+    return np.broadcast_to(values, (height, width)).copy()
+
+
+class SnapshotWriter:
+    """Constant-memory writer of normalised model frames"""
+
+    def __init__(
+        self,
+        fname: str,
+        width: int,
+        height: int,
+        frames: int = 1000,
+        field: str = "v",
+    ) -> None:
+        """Snapshot writer
+
+        Frames are appended to a memory-mapped .npy stack of shape
+        (frames, height, width), or saved as a PNG sequence when `fname` is
+        a pattern with an `{index}` field, e.g. "frame_{index:05d}.png".
+
+        Args:
+            fname (str): Output file name (npy) or PNG file name pattern.
+            width (int): Frame width.
+            height (int): Frame height.
+            frames (int, optional): Capacity of the .npy stack. Defaults to
+                1000.
+            field (str, optional): Substance, "u" or "v". Defaults to "v".
+        """
+        if field not in ("u", "v"):
+            raise ValueError(f"Unexpected field: {field}")
+        self._fname = fname
+        self._field = field
+        self._count = 0
+        self._stack = None
+        if "{" not in fname:
+            self._stack = np.lib.format.open_memmap(
+                fname, mode="w+", dtype=np.uint8, shape=(frames, height, width)
+            )
+
+    @property
+    def count(self) -> int:
+        """Number of written frames
+
+        Returns:
+            int: Number of written frames
+        """
+        return self._count
+
+    def write(self, model: GrayScottModel) -> None:
+        """Append a frame.
+
+        Args:
+            model (GrayScottModel): Gray-Scott Model.
+        """
+        frame = (getattr(model, self._field) * 255).astype(np.uint8)
+        if self._stack is None:
+            Image.fromarray(frame).save(self._fname.format(index=self._count))
+        elif self._count < len(self._stack):
+            self._stack[self._count] = frame
+        else:
+            raise ValueError("Snapshot stack is full")
+        self._count += 1
+
+    def close(self) -> None:
+        """Flush and close the .npy stack."""
+        if self._stack is not None:
+            self._stack.flush()
+            self._stack = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def benchmark(
+    size: int = 256,
+    duration: int = 5000,
+    dt: float = 10.0,
+    seed: int = 0,
+) -> None:
+    """Compare time-to-pattern of `compute` and `compute_spectral`.
+
+    Both integrators start from the same random seeds and run for the same
+    model time; patterned area and wall time are printed.
+
+    Args:
+        size (int, optional): Grid size. Defaults to 256.
+        duration (int, optional): Model time. Defaults to 5000.
+        dt (float, optional): Spectral time step. Defaults to 10.0.
+        seed (int, optional): Random seed. Defaults to 0.
+    """
+    mask = np.random.default_rng(seed).random((size, size)) < 0.05
+    runs = {
+        "explicit (dt=1)": lambda gsm: gsm.compute(duration),
+        f"spectral (dt={dt:g})": lambda gsm: gsm.compute_spectral(
+            int(duration / dt), dt
+        ),
+    }
+    for name, run in runs.items():
+        gsm = GrayScottModel.from_mask(mask, 0.1, 0.05)
+        start = time.perf_counter()
+        run(gsm)
+        elapsed = time.perf_counter() - start
+        area = np.mean(gsm._v > 0.1)
+        print(f"{name:>20}: {elapsed:7.2f} s, patterned area {area:.3f}")
 
 
 if __name__ == "__main__":
-    fig, ax = plt.subplots()
-    ims = []
+    import matplotlib
+    import matplotlib.animation as animation
+    import matplotlib.pyplot as plt
+
+    matplotlib.use("TkAgg")
 
     gsm = GrayScottModel(100, 100, 0.1, 0.05)
 
-    for i in range(5000):
-        gsm.compute()
-        if i % 100 == 0 and i != 0:
-            im = ax.imshow(gsm.v, cmap="Greys", animated=True)
-            ims.append([im])
+    with SnapshotWriter("gray_scott_model.npy", 100, 100, frames=50) as writer:
+        gsm.run(5000, writer, every=100)
+
+    frames = np.load("gray_scott_model.npy", mmap_mode="r")
+    fig, ax = plt.subplots()
+    im = ax.imshow(frames[0], cmap="Greys", animated=True)
+
+    def update(i):
+        im.set_array(frames[i])
+        return [im]
 
-    ani = animation.ArtistAnimation(
-        fig, ims, interval=50, blit=True, repeat_delay=1000
+    ani = animation.FuncAnimation(
+        fig, update, frames=len(frames), interval=50, blit=True
     )
     plt.show()
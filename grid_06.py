@@ -5,55 +5,158 @@ Grid 06
 
 """
 
-import itertools
-import random
-
 import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+# Face centres of a unit voxel, relative to its centre
+_FACES = np.array(
+    [
+        (0.5, 0, 0),
+        (-0.5, 0, 0),
+        (0, 0.5, 0),
+        (0, -0.5, 0),
+        (0, 0, 0.5),
+        (0, 0, -0.5),
+    ],
+    dtype=np.float32,
+)
+
+
+def create_grid(grid_size: int = 5, seed: int | None = None) -> np.ndarray:
+    """Create grid of voxels, each joining its six faces in three random pairs.
+
+    All voxels are drawn at once: a random permutation of the six faces per
+    voxel, split into consecutive pairs.
+
+    Args:
+        grid_size (int, optional): Grid size. Defaults to 5.
+        seed (int | None, optional): Random seed. Defaults to None.
+
+    Returns:
+        np.ndarray: Segments, shape (grid_size**3 * 3, 4, 3).
+    """
+    rng = np.random.default_rng(seed)
+    voxels = np.indices((grid_size,) * 3, dtype=np.float32).reshape(3, -1).T
+    order = rng.permuted(np.tile(np.arange(6), (len(voxels), 1)), axis=1)
+    pairs = _FACES[order].reshape(-1, 3, 2, 3)
+    # Face, halfway to the centre, halfway to the centre, face
+    scale = np.array([1, 0.5, 0.5, 1], dtype=np.float32)[:, None]
+    segments = pairs[:, :, [0, 0, 1, 1]] * scale + voxels[:, None, None]
+    return segments.reshape(-1, 4, 3)
+
+
+def project(
+    points: np.ndarray,
+    azimuth: float = -60.0,
+    elevation: float = 30.0,
+    distance: float | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Project points onto the view plane of a camera looking at the origin.
 
+    Args:
+        points (np.ndarray): Points, shape (..., 3).
+        azimuth (float, optional): Camera azimuth in degrees. Defaults to -60.
+        elevation (float, optional): Camera elevation in degrees. Defaults to
+            30.
+        distance (float | None, optional): Camera distance for a perspective
+            projection, None for orthographic. Defaults to None.
 
-def _get_voxel_faces(i, j, z, offset=0.5):
-    return [
-        (i + offset, j, z),
-        (i - offset, j, z),
-        (i, j + offset, z),
-        (i, j - offset, z),
-        (i, j, z + offset),
-        (i, j, z - offset),
-    ]
-
-
-def create_grid(grid_size: int = 5) -> list:
-    grid = itertools.product(range(grid_size), repeat=3)
-    segments = []
-    for voxel in grid:
-        faces = _get_voxel_faces(*voxel)
-        for _ in range(3):
-            v1, v2 = random.sample(faces, 2)
-            faces.remove(v1)
-            faces.remove(v2)
-            v1 = np.array(v1)
-            v4 = np.array(v2)
-            segments.append(
-                [
-                    v1,
-                    v1 + (np.array(voxel) - v1) / 2,
-                    v4 + (np.array(voxel) - v4) / 2,
-                    v4,
-                ]
-            )
-    return segments
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Projected points, shape (..., 2), and
+            depth towards the camera, shape (...).
+    """
+    azimuth, elevation = np.radians(azimuth), np.radians(elevation)
+    sin_a, cos_a = np.sin(azimuth), np.cos(azimuth)
+    sin_e, cos_e = np.sin(elevation), np.cos(elevation)
+    # Rows: right, up and towards the camera
+    view = np.array(
+        [
+            (-sin_a, cos_a, 0),
+            (-sin_e * cos_a, -sin_e * sin_a, cos_e),
+            (cos_e * cos_a, cos_e * sin_a, sin_e),
+        ],
+        dtype=points.dtype,
+    )
+    projected = points @ view.T
+    xy, depth = projected[..., :2], projected[..., 2]
+    if distance is not None:
+        xy = xy * (distance / (distance - depth))[..., None]
+    return xy, depth
+
+
+def line_collection(
+    segments: np.ndarray,
+    azimuth: float = -60.0,
+    elevation: float = 30.0,
+    distance: float | None = None,
+    linewidth: float = 1.0,
+    depth_shading: bool = True,
+) -> LineCollection:
+    """Project segments into one depth-sorted LineCollection.
+
+    Segments are drawn back to front, far ones lighter when shaded.
+
+    Args:
+        segments (np.ndarray): Segments, shape (N, M, 3).
+        azimuth (float, optional): Camera azimuth in degrees. Defaults to -60.
+        elevation (float, optional): Camera elevation in degrees. Defaults to
+            30.
+        distance (float | None, optional): Camera distance from the grid
+            centre, None for orthographic. Defaults to None.
+        linewidth (float, optional): Line width. Defaults to 1.0.
+        depth_shading (bool, optional): Depth shading. Defaults to True.
+
+    Returns:
+        LineCollection: Line collection.
+    """
+    centre = (segments.min(axis=(0, 1)) + segments.max(axis=(0, 1))) / 2
+    xy, depth = project(segments - centre, azimuth, elevation, distance)
+    depth = depth.mean(axis=1)
+    order = np.argsort(depth)
+    colors = np.zeros((len(order), 3))
+    if depth_shading and depth.size:
+        span = np.ptp(depth) or 1
+        colors[:] = (0.75 * (depth.max() - depth[order]) / span)[:, None]
+    return LineCollection(xy[order], colors=colors, linewidths=linewidth)
+
+
+def render(
+    segments: np.ndarray,
+    fname: str,
+    size: int = 1024,
+    background: str = "white",
+    **kwargs,
+) -> None:
+    """Render segments to an image without a display.
+
+    Args:
+        segments (np.ndarray): Segments, shape (N, M, 3).
+        fname (str): Output file name, the format follows the extension
+            (png, svg, pdf).
+        size (int, optional): Image size in pixels. Defaults to 1024.
+        background (str, optional): Background color. Defaults to "white".
+        **kwargs: `line_collection` arguments.
+    """
+    fig = Figure(figsize=(size / 100, size / 100), dpi=100)
+    ax = fig.add_axes((0, 0, 1, 1))
+    ax.set_axis_off()
+    ax.add_collection(line_collection(segments, **kwargs))
+    ax.set_aspect("equal")
+    ax.autoscale_view()
+    fig.savefig(fname, facecolor=background)
 
 
 if __name__ == "__main__":
     matplotlib.use("TkAgg")
-    fig = plt.figure()
-    ax = fig.add_subplot(111, projection="3d")
+    fig, ax = plt.subplots()
     ax.set_axis_off()
 
     segments = create_grid(5)
 
-    for segment in segments:
-        ax.plot(*np.array(segment).T, c="black")
+    ax.add_collection(line_collection(segments))
+    ax.set_aspect("equal")
+    ax.autoscale_view()
     plt.show()
@@ -7,11 +7,10 @@ Links:
     https://en.wikipedia.org/wiki/Harmonograph
 """
 
-import matplotlib
-import matplotlib.pyplot as plt
-import numpy as np
+from collections.abc import Iterator
 
-matplotlib.use("TkAgg")
+import numpy as np
+from PIL import Image
 
 
 class Harmonograph2D:
@@ -61,6 +60,7 @@ class Harmonograph2D:
         star_time=0,
         end_time=100,
         time_delta=0.01,
+        tolerance=None,
     ):
         """Generate Harmonograph 2D
 
@@ -68,18 +68,332 @@ class Harmonograph2D:
             star_time (float, optional): Star time. Defaults to 0.
             end_time (float, optional): End time. Defaults to 100.
             time_delta (float, optional): Time delta. Defaults to 0.01.
+            tolerance (float, optional): Maximum chord deviation for
+                curvature-adaptive steps (see `iter_adaptive`), None for fixed
+                steps. Defaults to None.
 
         Returns:
             tuple: x, y
         """
+        if tolerance is not None:
+            x, y = [np.empty(0)], [np.empty(0)]
+            for chunk_x, chunk_y in self.iter_adaptive(
+                star_time, end_time, time_delta, tolerance
+            ):
+                # Chunks share their end points
+                first = 1 if len(x) > 1 else 0
+                x.append(chunk_x[first:])
+                y.append(chunk_y[first:])
+            return np.concatenate(x), np.concatenate(y)
         t = np.arange(star_time, end_time, time_delta)
         f = Harmonograph2D._gen_f(
             self._amplitude, self._phase, self._decay, self._frequency
         )
         return f(t, 0) + f(t, 1), f(t, 2) + f(t, 3)
 
+    def _derivatives(self, t):
+        """Position, velocity and acceleration, each as (x, y), at times t."""
+        amplitude = np.asarray(self._amplitude, dtype=np.float64)[:, None]
+        phase = np.asarray(self._phase, dtype=np.float64)[:, None]
+        decay = np.asarray(self._decay, dtype=np.float64)[:, None]
+        frequency = np.asarray(self._frequency, dtype=np.float64)[:, None]
+        envelope = amplitude * np.exp(-decay * t)
+        angle = frequency * t + phase
+        sin, cos = envelope * np.sin(angle), envelope * np.cos(angle)
+        terms = (
+            sin,
+            frequency * cos - decay * sin,
+            (decay**2 - frequency**2) * sin - 2 * decay * frequency * cos,
+        )
+        return [(term[0] + term[1], term[2] + term[3]) for term in terms]
+
+    def iter_adaptive(
+        self,
+        star_time=0,
+        end_time=100,
+        time_delta=0.01,
+        tolerance=1e-3,
+        max_step=1.0,
+        chunk_size=1_000_000,
+    ) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """Generate Harmonograph 2D with curvature-adaptive steps, in chunks
+
+        A chord of duration h deviates from the curve by at most about
+        h**2 * max|a| / 8, where a is the acceleration, known analytically
+        and maximized over the chord. The full acceleration also bounds
+        turnarounds, where the curve runs back along itself and the normal
+        acceleration is zero. Samples are spread so this stays under
+        `tolerance`: |a| is replaced by its running maximum over a window
+        of +-`max_step`, which covers every possible step, and the sample
+        density sqrt(max|a| / (8 * tolerance)) is integrated on the fixed
+        `time_delta` grid and sampled at each whole unit. Turns keep fine
+        steps while straight stretches take long ones. As the curve decays
+        its acceleration shrinks with it, so the step grows like
+        sqrt(tolerance / amplitude), up to `max_step`.
+
+        Args:
+            star_time (float, optional): Star time. Defaults to 0.
+            end_time (float, optional): End time. Defaults to 100.
+            time_delta (float, optional): Time delta of the evaluation grid.
+                Defaults to 0.01.
+            tolerance (float, optional): Maximum chord deviation, in curve
+                units. Defaults to 1e-3.
+            max_step (float, optional): Maximum time step. Defaults to 1.0.
+            chunk_size (int, optional): Grid points per chunk. Defaults to
+                1_000_000.
+
+        Yields:
+            tuple: x, y. Each chunk starts with the last point of the
+                previous one, so chunks can be drawn as separate lines.
+        """
+        count = len(np.arange(star_time, end_time, time_delta))
+        radius = max(int(np.ceil(max_step / time_delta)), 1)
+        carry = 0.0
+        for start in range(0, count - 1, chunk_size):
+            stop = min(start + chunk_size, count - 1) + 1
+            # Acceleration over the chunk and a window margin on each side
+            index = np.arange(
+                max(start - radius, 0), min(stop + radius, count)
+            )
+            _, _, (ddx, ddy) = self._derivatives(
+                star_time + index * time_delta
+            )
+            inner = slice(start - index[0], stop - index[0])
+            peak = _running_max(np.hypot(ddx, ddy), radius)[inner]
+            t = star_time + index[inner] * time_delta
+            density = np.maximum(np.sqrt(peak / (8 * tolerance)), 1 / max_step)
+            # Number of samples up to each grid time
+            cumulative = np.empty_like(t)
+            cumulative[0] = carry
+            np.cumsum(
+                (density[1:] + density[:-1]) * (time_delta / 2),
+                out=cumulative[1:],
+            )
+            cumulative[1:] += carry
+            samples = np.arange(
+                np.floor(cumulative[0]) + 1, np.ceil(cumulative[-1])
+            )
+            times = np.concatenate(
+                ([t[0]], np.interp(samples, cumulative, t), [t[-1]])
+            )
+            carry = cumulative[-1] % 1
+            (x, y), _, _ = self._derivatives(times)
+            yield x, y
+        if count == 1:
+            (x, y), _, _ = self._derivatives(np.array([star_time]))
+            yield x, y
+
+
+def _running_max(values: np.ndarray, radius: int) -> np.ndarray:
+    """Maximum of `values` over a window of +-`radius` around each element
+
+    Args:
+        values (np.ndarray): 1D values.
+        radius (int): Window radius, in elements.
+
+    Returns:
+        np.ndarray: Windowed maxima, same shape as `values`.
+    """
+    size = 2 * radius + 1
+    padded = np.pad(values, radius, mode="edge")
+    # Maxima over windows of `width` elements, doubling the width each step
+    result, width = padded, 1
+    while 2 * width <= size:
+        result = np.maximum(result[:-width], result[width:])
+        width *= 2
+    # Two overlapping windows of `width` elements cover `size`
+    return np.maximum(
+        result[: len(values)],
+        result[size - width : size - width + len(values)],
+    )
+
+
+def random_inputs(n: int, seed: int | None = None) -> tuple:
+    """Random inputs for many harmonographs, as in `create_random_inputs`
+
+    Args:
+        n (int): Number of harmonographs.
+        seed (int | None, optional): Random seed. Defaults to None.
+
+    Returns:
+        tuple: amplitude, phase, decay, frequency, each of shape (n, 4).
+    """
+    rng = np.random.default_rng(seed)
+    a = np.ones((n, 4), dtype=np.float64)
+    p = rng.random((n, 4)) * 2
+    d = rng.random((n, 4)) / 50
+    f = rng.integers(1, 4, (n, 4))
+    return a, p, d, f
+
+
+def generate_batch(
+    amplitude,
+    phase,
+    decay,
+    frequency,
+    star_time=0,
+    end_time=100,
+    time_delta=0.01,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Generate many Harmonograph 2D in one broadcast
+
+    Args:
+        amplitude (np.ndarray): Amplitude, shape (N, 4).
+        phase (np.ndarray): Phase, shape (N, 4).
+        decay (np.ndarray): Decay, shape (N, 4).
+        frequency (np.ndarray): Frequency, shape (N, 4).
+        star_time (float, optional): Star time. Defaults to 0.
+        end_time (float, optional): End time. Defaults to 100.
+        time_delta (float, optional): Time delta. Defaults to 0.01.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: x, y, each of shape (N, T).
+    """
+    t = np.arange(star_time, end_time, time_delta)
+    amplitude, phase, decay, frequency = (
+        np.asarray(value, dtype=np.float64)[..., None]
+        for value in (amplitude, phase, decay, frequency)
+    )
+    values = amplitude * np.sin(t * frequency + phase) * np.exp(-decay * t)
+    return values[:, 0] + values[:, 1], values[:, 2] + values[:, 3]
+
+
+def _splat(x, y, size, shared):
+    """Anti-aliased line strips: bilinear splats at most a pixel apart.
+
+    Each strip (row of x, y, in pixels) adds the line length passing near a
+    pixel to its own (size, size) buffer, or to one buffer when shared.
+
+    Returns:
+        np.ndarray: Flat buffers.
+    """
+    dx, dy = np.diff(x, axis=1), np.diff(y, axis=1)
+    lengths = np.hypot(dx, dy).ravel()
+    steps = np.maximum(np.ceil(lengths), 1).astype(np.int64)
+    # Subdivide every segment into `steps` pieces, splat their midpoints
+    segment = np.repeat(np.arange(len(lengths)), steps)
+    fraction = np.arange(len(segment)) - np.repeat(
+        np.cumsum(steps) - steps, steps
+    )
+    fraction = (fraction + 0.5) / steps[segment]
+    px = x[:, :-1].ravel()[segment] + fraction * dx.ravel()[segment]
+    py = y[:, :-1].ravel()[segment] + fraction * dy.ravel()[segment]
+    weight = (lengths / steps)[segment]
+    base = 0 if shared else segment // dx.shape[1] * size * size
+    x0, y0 = np.floor(px), np.floor(py)
+    fx, fy = px - x0, py - y0
+    index = base + y0.astype(np.int64) * size + x0.astype(np.int64)
+    length = (1 if shared else len(x)) * size * size
+    return sum(
+        np.bincount(index + shift, weight * w, minlength=length)
+        for shift, w in (
+            (0, (1 - fx) * (1 - fy)),
+            (1, fx * (1 - fy)),
+            (size, (1 - fx) * fy),
+            (size + 1, fx * fy),
+        )
+    )
+
+
+def render_batch(
+    amplitude,
+    phase,
+    decay,
+    frequency,
+    size=128,
+    star_time=0,
+    end_time=100,
+    time_delta=0.01,
+    shared=False,
+    margin=4,
+    batch_size=32,
+) -> np.ndarray:
+    """Rasterize many Harmonograph 2D without matplotlib
+
+    Curves are evaluated `batch_size` at a time with `generate_batch` and
+    drawn as anti-aliased lines into accumulation buffers, where each pixel
+    holds the length of line passing through it.
+
+    Args:
+        amplitude (np.ndarray): Amplitude, shape (N, 4).
+        phase (np.ndarray): Phase, shape (N, 4).
+        decay (np.ndarray): Decay, shape (N, 4).
+        frequency (np.ndarray): Frequency, shape (N, 4).
+        size (int, optional): Buffer size in pixels. Defaults to 128.
+        star_time (float, optional): Star time. Defaults to 0.
+        end_time (float, optional): End time. Defaults to 100.
+        time_delta (float, optional): Time delta. Defaults to 0.01.
+        shared (bool, optional): Draw all curves into one buffer, on a common
+            scale. Defaults to False.
+        margin (int, optional): Margin in pixels. Defaults to 4.
+        batch_size (int, optional): Curves evaluated at once. Defaults to 32.
+
+    Returns:
+        np.ndarray: (N, size, size) buffers, or (size, size) when shared.
+    """
+    amplitude = np.asarray(amplitude, dtype=np.float64)
+    # Every curve stays within the sum of its amplitudes
+    extent = np.abs(amplitude).reshape(-1, 2, 2).sum(axis=2).max(axis=1)
+    if shared:
+        extent[:] = extent.max()
+    scale = (size / 2 - max(margin, 1)) / np.maximum(extent, 1e-12)
+    count = 1 if shared else len(amplitude)
+    buffers = np.zeros((count, size, size), dtype=np.float32)
+    for start in range(0, len(amplitude), batch_size):
+        batch = slice(start, start + batch_size)
+        x, y = generate_batch(
+            amplitude[batch],
+            np.asarray(phase)[batch],
+            np.asarray(decay)[batch],
+            np.asarray(frequency)[batch],
+            star_time,
+            end_time,
+            time_delta,
+        )
+        curve_scale = scale[batch, None]
+        splat = _splat(
+            x * curve_scale + size / 2,
+            size / 2 - y * curve_scale,
+            size,
+            shared,
+        ).reshape(-1, size, size)
+        buffers[slice(None) if shared else batch] += splat
+    return buffers[0] if shared else buffers
+
+
+def contact_sheet(
+    buffers: np.ndarray, columns: int | None = None, gamma: float = 0.5
+) -> Image.Image:
+    """Contact sheet of accumulation buffers, dark lines on white
+
+    Each buffer is normalised by its own 99.5th percentile.
+
+    Args:
+        buffers (np.ndarray): Buffers, shape (N, H, W).
+        columns (int | None, optional): Number of columns, square by default.
+            Defaults to None.
+        gamma (float, optional): Gamma. Defaults to 0.5.
+
+    Returns:
+        Image.Image: Contact sheet.
+    """
+    count, height, width = buffers.shape
+    columns = columns or int(np.ceil(np.sqrt(count)))
+    rows = -(-count // columns)
+    level = np.percentile(buffers, 99.5, axis=(1, 2), keepdims=True)
+    tiles = np.zeros((rows * columns, height, width), dtype=np.float32)
+    tiles[:count] = np.clip(buffers / np.maximum(level, 1e-12), 0, 1) ** gamma
+    sheet = tiles.reshape(rows, columns, height, width).transpose(0, 2, 1, 3)
+    sheet = 255 * (1 - sheet.reshape(rows * height, columns * width))
+    return Image.fromarray(sheet.astype(np.uint8))
+
 
 if __name__ == "__main__":
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    matplotlib.use("TkAgg")
+
     a = [1, 1, 1, 1]  # Amplitude
     p = [1.57, 1, 0, 1.23]  # Phase
     d = [0.002, 0.001, 0.002, 0.001]  # Decay
@@ -7,6 +7,9 @@ Links:
     https://www.airtightinteractive.com/demos/js/imageglitcher/
 """
 
+from collections.abc import Iterator
+from multiprocessing import Pool, shared_memory
+
 import matplotlib
 import matplotlib.animation as animation
 import matplotlib.pyplot as plt
@@ -21,7 +24,7 @@ class ImageGlitcher:
 
     def __init__(
         self,
-        img_path: str,
+        img_path: str | np.ndarray,
         v_glitch: bool = True,
         v_intensity: float = 0.01,
         h_glitch: bool = True,
@@ -31,15 +34,18 @@ class ImageGlitcher:
         """Image Glitcher
 
         Args:
-            img_path (str): Image path.
+            img_path (str | np.ndarray): Image path, or RGB uint8 array.
             v_glitch (bool, optional): Vertical glitch. Defaults to True.
             v_intensity (float, optional): Intensity of vertical glitch. Defaults to 0.05.
             h_glitch (bool, optional): Horizontal glitch. Defaults to True.
             h_intensity (float, optional): Intensity of horizontal glitch. Defaults to 0.1.
             h_lines_count (int, optional): Number of horizontal glitch lines. Defaults to None.
         """
-        img = Image.open(img_path)
-        self._img = np.asarray(img.convert("RGB"))
+        if isinstance(img_path, np.ndarray):
+            self._img = img_path
+        else:
+            img = Image.open(img_path)
+            self._img = np.asarray(img.convert("RGB"))
         self._img_shape = self._img.shape
 
         self._v_glitch = v_glitch
@@ -50,44 +56,73 @@ class ImageGlitcher:
         )
         self._h_intensity = h_intensity
 
-    def _get_merged_channels(self, randomization: bool = True):
+        # Wave glitch: row j of a line is shifted by sin(4j) * 5, only a few
+        # distinct shifts
+        self._wave_shifts = (
+            np.sin(np.arange(self._img_shape[0]) * 4) * 5
+        ).astype(np.intp)
+
+    def _get_merged_channels(self, randomization: bool = True, rng=np.random):
         if randomization:
-            return np.random.choice(3, size=3, replace=True).tolist()
+            return rng.choice(3, size=3, replace=True).tolist()
         return [0, 1, 2]
 
-    def _get_random_transformation(self, line_length: int, intensity: float):
-        return np.random.randint(
+    def _get_random_transformation(
+        self, line_length: int, intensity: float, rng=np.random
+    ):
+        integers = (
+            rng.integers
+            if isinstance(rng, np.random.Generator)
+            else rng.randint
+        )
+        return integers(
             -int((line_length + 1) * intensity / 2),
             int((line_length + 1) * intensity / 2),
         )
 
-    def glitch(self) -> np.ndarray:
+    def glitch(
+        self,
+        out: np.ndarray | None = None,
+        rng: np.random.Generator | None = None,
+    ) -> np.ndarray:
         """Glitch
 
+        Args:
+            out (np.ndarray, optional): Output buffer of the image shape,
+                reusable between calls. Defaults to None.
+            rng (np.random.Generator, optional): Random generator. Defaults to
+                None (global `np.random` state).
+
         Returns:
             np.ndarray: Glitched image.
         """
-        new_img = np.copy(self._img)
-        new_img = np.moveaxis(new_img, -1, 0)
+        if out is None:
+            out = np.empty_like(self._img)
+        if rng is None:
+            rng = np.random
+        height, width = self._img_shape[:2]
+        pixels = out.view(np.dtype((np.void, 3)))[..., 0]
 
         # Vertical glitch
         if self._v_glitch:
-            merged_channels = self._get_merged_channels()
+            merged_channels = self._get_merged_channels(rng=rng)
             transformations = [
                 self._get_random_transformation(
-                    self._img_shape[0], self._v_intensity
+                    self._img_shape[0], self._v_intensity, rng
                 )
                 for _ in range(3)
             ]
             for i in range(3):
-                new_img[i] = np.roll(
-                    new_img[i], transformations[merged_channels[i]], 0
-                )
+                shift = transformations[merged_channels[i]] % height
+                out[shift:, :, i] = self._img[: height - shift, :, i]
+                out[:shift, :, i] = self._img[height - shift :, :, i]
+        else:
+            np.copyto(out, self._img)
 
         # Horizontal glitch
         if self._h_glitch:
             horizontal_lines = np.sort(
-                np.random.choice(
+                rng.choice(
                     self._img_shape[0] + 1,
                     size=self._h_lines_count - 1,
                     replace=False,
@@ -95,14 +130,14 @@ class ImageGlitcher:
             ).tolist()
 
             # Common color scheme
-            merged_channels = self._get_merged_channels()
+            merged_channels = self._get_merged_channels(rng=rng)
 
             for a, b in zip(
                 [0] + horizontal_lines, horizontal_lines + [self._img_shape[0]]
             ):
                 transformations = [
                     self._get_random_transformation(
-                        self._img_shape[1], self._h_intensity
+                        self._img_shape[1], self._h_intensity, rng
                     )
                     for _ in range(3)
                 ]
@@ -111,40 +146,139 @@ class ImageGlitcher:
                 # merged_channels = self._get_merged_channels()
 
                 # Randomly glitches some lines
-                if np.random.choice(2):
+                if rng.choice(2):
                     for i in range(3):
-                        new_img[i][a:b] = np.roll(
-                            new_img[i][a:b],
+                        out[a:b, :, i] = np.roll(
+                            out[a:b, :, i],
                             transformations[merged_channels[i]],
                             1,
                         )
 
-                if np.random.choice(2):
-                    for i in range(3):
-                        for j in range(b - a):
-                            new_img[i][a + j] = np.roll(
-                                new_img[i][a + j],
-                                int(np.sin(j * 4) * 5),  # WIP
-                                0,
-                            )
-        return np.moveaxis(new_img, 0, -1)
+                if rng.choice(2):
+                    # Rows grouped by shift, whole pixels (all channels)
+                    line = pixels[a:b].copy()
+                    shifts = self._wave_shifts[: b - a]
+                    for shift in np.unique(shifts):
+                        rows = a + np.flatnonzero(shifts == shift)
+                        shift %= width
+                        source = line[rows - a]
+                        pixels[rows, shift:] = source[:, : width - shift]
+                        pixels[rows, :shift] = source[:, width - shift :]
+        return out
 
+    def glitch_batch(
+        self,
+        n: int,
+        seed: int | None = None,
+        processes: int | None = None,
+    ) -> Iterator[np.ndarray]:
+        """Glitch many frames over a process pool
 
-if __name__ == "__main__":
-    # np.random.seed(0)
+        The source image is placed in shared memory once, and each frame
+        gets its own generator spawned from `seed`, so the frames do not
+        depend on the number of processes or on scheduling.
 
-    fig, ax = plt.subplots()
-    ims = []
+        Args:
+            n (int): Number of frames.
+            seed (int, optional): Random seed. Defaults to None.
+            processes (int, optional): Number of processes. Defaults to None
+                (CPU count).
+
+        Yields:
+            np.ndarray: Glitched frames, in order.
+        """
+        memory = shared_memory.SharedMemory(create=True, size=self._img.nbytes)
+        img = np.ndarray(self._img_shape, dtype=np.uint8, buffer=memory.buf)
+        img[...] = self._img
+        try:
+            settings = {
+                "v_glitch": self._v_glitch,
+                "v_intensity": self._v_intensity,
+                "h_glitch": self._h_glitch,
+                "h_intensity": self._h_intensity,
+                "h_lines_count": self._h_lines_count,
+            }
+            with Pool(
+                processes,
+                initializer=_init_glitch_worker,
+                initargs=(memory.name, self._img_shape, settings),
+            ) as pool:
+                yield from pool.imap(
+                    _glitch_frame, np.random.SeedSequence(seed).spawn(n)
+                )
+        finally:
+            del img
+            memory.close()
+            memory.unlink()
 
+    def save_batch(
+        self,
+        fname: str,
+        n: int,
+        seed: int | None = None,
+        processes: int | None = None,
+        duration: int = 150,
+    ) -> None:
+        """Save glitched frames
+
+        A PNG sequence is written frame by frame as the pool delivers it,
+        while GIF/APNG frames are collected for the encoder.
+
+        Args:
+            fname (str): Animated GIF/APNG file name, or a PNG sequence
+                pattern with an `{index}` field, e.g. "glitch_{index:04d}.png".
+            n (int): Number of frames.
+            seed (int, optional): Random seed. Defaults to None.
+            processes (int, optional): Number of processes. Defaults to None
+                (CPU count).
+            duration (int, optional): Frame duration in ms. Defaults to 150.
+        """
+        frames = self.glitch_batch(n, seed, processes)
+        if "{" in fname:
+            for index, frame in enumerate(frames):
+                Image.fromarray(frame).save(fname.format(index=index))
+            return
+        first = next(frames, None)
+        if first is None:
+            return
+        Image.fromarray(first).save(
+            fname,
+            save_all=True,
+            append_images=[Image.fromarray(frame) for frame in frames],
+            duration=duration,
+            loop=0,
+        )
+
+
+# Glitcher of a pool worker, reading the source image from shared memory
+_worker_glitcher = None
+
+
+def _init_glitch_worker(name: str, shape: tuple, settings: dict) -> None:
+    global _worker_glitcher
+    memory = shared_memory.SharedMemory(name=name)
+    img = np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)
+    _worker_glitcher = (ImageGlitcher(img, **settings), memory)
+
+
+def _glitch_frame(seed_seq: np.random.SeedSequence) -> np.ndarray:
+    glitcher, _ = _worker_glitcher
+    return glitcher.glitch(rng=np.random.default_rng(seed_seq))
+
+
+if __name__ == "__main__":
     image_glitcher = ImageGlitcher("house.tiff")
+    frames = list(image_glitcher.glitch_batch(15, seed=0))
+
+    fig, ax = plt.subplots()
+    im = ax.imshow(frames[0], animated=True)
 
-    for i in range(15):
-        glitched_img = image_glitcher.glitch()
-        im = ax.imshow(glitched_img, animated=True)
-        ims.append([im])
+    def update(i):
+        im.set_data(frames[i])
+        return (im,)
 
-    ani = animation.ArtistAnimation(
-        fig, ims, interval=150, blit=True, repeat_delay=0
+    ani = animation.FuncAnimation(
+        fig, update, frames=len(frames), interval=150, blit=True
     )
 
     plt.show()